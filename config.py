@@ -25,6 +25,11 @@ class Config:
     TEMPLATES_FOLDER = "templates"
     COMPRESSOR_DEBUG = environ.get("COMPRESSOR_DEBUG")
 
+    # Compiled Jinja templates are cached here so restarted workers skip
+    # recompiling them; off unless set. The directory must be private to
+    # the app's user (see init_jinja_bytecode_cache)
+    JINJA_BYTECODE_CACHE_DIR = environ.get("JINJA_BYTECODE_CACHE_DIR")
+
     # Database - Railway provides DATABASE_URL, fallback to SQLALCHEMY_DATABASE_URI
     SQLALCHEMY_DATABASE_URI = environ.get('SQLALCHEMY_DATABASE_URI') or environ.get('DATABASE_URL')
     SQLALCHEMY_ECHO = False
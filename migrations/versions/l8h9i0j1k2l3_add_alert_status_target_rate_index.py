@@ -0,0 +1,31 @@
+"""add composite index for alert rate threshold checks
+
+Revision ID: l8h9i0j1k2l3
+Revises: k7g8h9i0j1k2
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'l8h9i0j1k2l3'
+down_revision = 'k7g8h9i0j1k2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Supports the rate updater's lookup of active alerts whose target rate
+    # has been reached (payment_status = :status AND target_interest_rate >= :rate)
+    op.create_index(
+        'idx_alert_status_target_rate',
+        'alert',
+        ['payment_status', 'target_interest_rate'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('idx_alert_status_target_rate', table_name='alert')
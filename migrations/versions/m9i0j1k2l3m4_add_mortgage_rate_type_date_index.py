@@ -0,0 +1,32 @@
+"""add rate type/date index for mortgage rate history lookups
+
+Revision ID: m9i0j1k2l3m4
+Revises: l8h9i0j1k2l3
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'm9i0j1k2l3m4'
+down_revision = 'l8h9i0j1k2l3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves per-type history reads (rate_type = :type AND date >= :cutoff
+    # ORDER BY date DESC) and latest-rate lookups with a single index range
+    # scan; idx_rate_date_type leads with date and can't be used for these
+    op.create_index(
+        'idx_rate_type_date',
+        'mortgage_rate',
+        ['rate_type', 'date'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('idx_rate_type_date', table_name='mortgage_rate')
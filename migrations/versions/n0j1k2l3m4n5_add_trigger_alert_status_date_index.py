@@ -0,0 +1,32 @@
+"""add composite index for per-alert trigger cooldown lookups
+
+Revision ID: n0j1k2l3m4n5
+Revises: m9i0j1k2l3m4
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'n0j1k2l3m4n5'
+down_revision = 'm9i0j1k2l3m4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Supports the alert checks' cooldown lookups (alert_id = :id AND
+    # alert_trigger_status = 1 AND alert_trigger_date > :cutoff) as a single
+    # index range scan per alert
+    op.create_index(
+        'idx_trigger_alert_status_date',
+        'trigger',
+        ['alert_id', 'alert_trigger_status', 'alert_trigger_date'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('idx_trigger_alert_status_date', table_name='trigger')
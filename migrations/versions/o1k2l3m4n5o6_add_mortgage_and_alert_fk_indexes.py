@@ -0,0 +1,39 @@
+"""add indexes on mortgage.user_id and alert.mortgage_id
+
+Revision ID: o1k2l3m4n5o6
+Revises: n0j1k2l3m4n5
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'o1k2l3m4n5o6'
+down_revision = 'n0j1k2l3m4n5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres does not index foreign key columns automatically; these back
+    # the per-user mortgage lookups and the alerts eager load
+    # (mortgage_id IN (...)) on every dashboard request
+    op.create_index(
+        'idx_mortgage_user_id',
+        'mortgage',
+        ['user_id'],
+        unique=False
+    )
+    op.create_index(
+        'idx_alert_mortgage_id',
+        'alert',
+        ['mortgage_id'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('idx_alert_mortgage_id', table_name='alert')
+    op.drop_index('idx_mortgage_user_id', table_name='mortgage')
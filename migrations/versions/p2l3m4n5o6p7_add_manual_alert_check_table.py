@@ -0,0 +1,39 @@
+"""add manual_alert_check table
+
+Revision ID: p2l3m4n5o6p7
+Revises: o1k2l3m4n5o6
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'p2l3m4n5o6p7'
+down_revision = 'o1k2l3m4n5o6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Queued manual alert checks run on whichever worker queued them, but the
+    # status can be polled from any worker, so it lives in the database
+    op.create_table('manual_alert_check',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('created_on', sa.DateTime(), nullable=False),
+        sa.Column('completed_on', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_manual_alert_check_created_on'),
+        'manual_alert_check',
+        ['created_on'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_manual_alert_check_created_on'), table_name='manual_alert_check')
+    op.drop_table('manual_alert_check')
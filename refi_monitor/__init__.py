@@ -1,5 +1,6 @@
 """Initialize Flask app."""
 import os
+import stat
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
@@ -38,6 +39,34 @@ def init_sentry():
         )
 
 
+def init_jinja_bytecode_cache(app):
+    """
+    Persist compiled templates across worker restarts outside debug mode.
+
+    Cached bytecode is executed as-is, so the directory must belong to this
+    process's user and be closed to everyone else; otherwise the cache stays
+    off.
+    """
+    cache_dir = app.config.get('JINJA_BYTECODE_CACHE_DIR')
+    if app.debug or not cache_dir:
+        return
+    from jinja2 import FileSystemBytecodeCache
+
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    st = os.lstat(cache_dir)
+    if (
+        not stat.S_ISDIR(st.st_mode)
+        or st.st_uid != os.getuid()
+        or stat.S_IMODE(st.st_mode) & 0o077
+    ):
+        app.logger.warning(
+            f"Jinja bytecode cache disabled: {cache_dir} must be a directory "
+            f"owned by uid {os.getuid()} with mode 0700"
+        )
+        return
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+
 def init_app():
     """Construct core Flask application."""
     # Initialize Sentry before creating the app
@@ -45,6 +74,7 @@ def init_app():
 
     app = Flask(__name__, instance_relative_config=False)
     app.config.from_object('config.Config')
+    init_jinja_bytecode_cache(app)
     assets = Environment()
     assets.init_app(app)
 
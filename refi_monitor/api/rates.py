@@ -1,6 +1,6 @@
 """API endpoints for mortgage rate history and trends."""
-from datetime import datetime, timedelta
-from flask import Blueprint, jsonify, request, Response
+from datetime import date, datetime, timedelta
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 from sqlalchemy import func, desc
 import csv
 import io
@@ -11,21 +11,27 @@ from .. import db, limiter
 
 rates_bp = Blueprint('rates_bp', __name__, url_prefix='/api/rates')
 
-# Map rate_type strings to term_months
-RATE_TYPE_MAP = {
-    '30-year-fixed': 360,
-    '15-year-fixed': 180,
-    '20-year-fixed': 240,
-    '10-year-fixed': 120,
+# Map API rate_type ids to MortgageRate.rate_type values
+MODEL_RATE_TYPES = {
+    '30-year-fixed': '30_year_fixed',
+    '15-year-fixed': '15_year_fixed',
+    'fha-30': 'FHA_30',
+    'va-30': 'VA_30',
+    '5-1-arm': '5_1_ARM',
+    '7-1-arm': '7_1_ARM',
+    '10-1-arm': '10_1_ARM',
 }
 
 # Reverse map for display
-TERM_TO_TYPE = {v: k for k, v in RATE_TYPE_MAP.items()}
+API_RATE_TYPES = {v: k for k, v in MODEL_RATE_TYPES.items()}
 
+# Rows fetched from the database and written per chunk when exporting CSV
+EXPORT_BATCH_SIZE = 1000
 
-def get_term_months(rate_type):
-    """Convert rate_type string to term_months integer."""
-    return RATE_TYPE_MAP.get(rate_type, 360)
+
+def get_model_rate_type(rate_type):
+    """Convert an API rate_type id to a MortgageRate.rate_type value."""
+    return MODEL_RATE_TYPES.get(rate_type, '30_year_fixed')
 
 
 @rates_bp.route('/current', methods=['GET'])
@@ -33,10 +39,7 @@ def get_term_months(rate_type):
 def get_current_rates():
     """
     GET /api/rates/current
-    Returns today's rates for all rate types.
-
-    Query params:
-        zip_code (optional): Filter by zip code. Defaults to national average.
+    Returns the latest national rates for all rate types.
 
     Response:
         {
@@ -45,40 +48,32 @@ def get_current_rates():
                 "30-year-fixed": 6.875,
                 "15-year-fixed": 6.125,
                 ...
-            },
-            "zip_code": "00000"
+            }
         }
     """
-    zip_code = request.args.get('zip_code', '00000')  # 00000 = national average
-
     # Get the most recent date with rate data
-    latest_date_query = db.session.query(func.max(MortgageRate.rate_date)).filter(
-        MortgageRate.zip_code == zip_code
-    ).scalar()
+    latest_date_query = db.session.query(func.max(MortgageRate.date)).scalar()
 
     if not latest_date_query:
         return jsonify({
             'error': 'No rate data available',
             'date': None,
-            'rates': {},
-            'zip_code': zip_code
+            'rates': {}
         }), 404
 
     # Get all rates for the most recent date
-    rates = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.rate_date == latest_date_query
+    rates = db.session.query(MortgageRate.rate_type, MortgageRate.rate).filter(
+        MortgageRate.date == latest_date_query
     ).all()
 
-    rates_dict = {}
-    for rate in rates:
-        rate_type = TERM_TO_TYPE.get(rate.term_months, f'{rate.term_months}-month')
-        rates_dict[rate_type] = rate.rate
+    rates_dict = {
+        API_RATE_TYPES.get(model_type, model_type): float(rate)
+        for model_type, rate in rates
+    }
 
     return jsonify({
-        'date': latest_date_query.strftime('%Y-%m-%d') if latest_date_query else None,
-        'rates': rates_dict,
-        'zip_code': zip_code
+        'date': latest_date_query.strftime('%Y-%m-%d'),
+        'rates': rates_dict
     })
 
 
@@ -92,14 +87,12 @@ def get_rate_history():
     Query params:
         rate_type (optional): Rate type (e.g., '30-year-fixed'). Defaults to '30-year-fixed'.
         days (optional): Number of days of history. Defaults to 90.
-        zip_code (optional): Filter by zip code. Defaults to national average.
         start_date (optional): Start date (YYYY-MM-DD). Overrides days param.
         end_date (optional): End date (YYYY-MM-DD). Defaults to today.
 
     Response:
         {
             "rate_type": "30-year-fixed",
-            "zip_code": "00000",
             "data": [
                 {"date": "2026-01-01", "rate": 6.875},
                 {"date": "2026-01-02", "rate": 6.750},
@@ -113,44 +106,43 @@ def get_rate_history():
     """
     rate_type = request.args.get('rate_type', '30-year-fixed')
     days = request.args.get('days', 90, type=int)
-    zip_code = request.args.get('zip_code', '00000')
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
 
-    term_months = get_term_months(rate_type)
+    model_rate_type = get_model_rate_type(rate_type)
 
     # Build date range
     if end_date:
         try:
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d').date()
         except ValueError:
             return jsonify({'error': 'Invalid end_date format. Use YYYY-MM-DD'}), 400
     else:
-        end_dt = datetime.now()
+        end_dt = date.today()
 
     if start_date:
         try:
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d').date()
         except ValueError:
             return jsonify({'error': 'Invalid start_date format. Use YYYY-MM-DD'}), 400
     else:
         start_dt = end_dt - timedelta(days=days)
 
-    # Query rate history
-    rates = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.term_months == term_months,
-        MortgageRate.rate_date >= start_dt,
-        MortgageRate.rate_date <= end_dt
-    ).order_by(MortgageRate.rate_date.asc()).all()
+    # Query rate history; only the two columns are selected, so no ORM
+    # objects are built for what is a plain time series
+    rates = db.session.query(MortgageRate.date, MortgageRate.rate).filter(
+        MortgageRate.rate_type == model_rate_type,
+        MortgageRate.date >= start_dt,
+        MortgageRate.date <= end_dt
+    ).order_by(MortgageRate.date.asc()).all()
 
     data = [
-        {'date': r.rate_date.strftime('%Y-%m-%d'), 'rate': r.rate}
-        for r in rates
+        {'date': rate_date.strftime('%Y-%m-%d'), 'rate': float(rate)}
+        for rate_date, rate in rates
     ]
 
-    if rates:
-        rate_values = [r.rate for r in rates]
+    if data:
+        rate_values = [point['rate'] for point in data]
         min_rate = min(rate_values)
         max_rate = max(rate_values)
         avg_rate = sum(rate_values) / len(rate_values)
@@ -159,7 +151,6 @@ def get_rate_history():
 
     return jsonify({
         'rate_type': rate_type,
-        'zip_code': zip_code,
         'data': data,
         'count': len(data),
         'min_rate': min_rate,
@@ -179,13 +170,11 @@ def get_rate_trend():
 
     Query params:
         rate_type (optional): Rate type (e.g., '30-year-fixed'). Defaults to '30-year-fixed'.
-        zip_code (optional): Filter by zip code. Defaults to national average.
         period (optional): Analysis period in days. Defaults to 30.
 
     Response:
         {
             "rate_type": "30-year-fixed",
-            "zip_code": "00000",
             "current_rate": 6.875,
             "previous_rate": 7.125,
             "change": -0.250,
@@ -200,52 +189,53 @@ def get_rate_trend():
         }
     """
     rate_type = request.args.get('rate_type', '30-year-fixed')
-    zip_code = request.args.get('zip_code', '00000')
     period = request.args.get('period', 30, type=int)
 
-    term_months = get_term_months(rate_type)
+    model_rate_type = get_model_rate_type(rate_type)
 
-    now = datetime.now()
-    period_start = now - timedelta(days=period)
-    week_ago = now - timedelta(days=7)
+    today = date.today()
+    period_start = today - timedelta(days=period)
+    week_ago = today - timedelta(days=7)
 
     # Get current rate (most recent)
     current = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.term_months == term_months
-    ).order_by(desc(MortgageRate.rate_date)).first()
+        MortgageRate.rate_type == model_rate_type
+    ).order_by(desc(MortgageRate.date)).first()
 
     if not current:
         return jsonify({
             'error': 'No rate data available',
-            'rate_type': rate_type,
-            'zip_code': zip_code
+            'rate_type': rate_type
         }), 404
 
     # Get rate from period start
     period_start_rate = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.term_months == term_months,
-        MortgageRate.rate_date <= period_start
-    ).order_by(desc(MortgageRate.rate_date)).first()
+        MortgageRate.rate_type == model_rate_type,
+        MortgageRate.date <= period_start
+    ).order_by(desc(MortgageRate.date)).first()
 
     # Get rate from a week ago
     week_rate = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.term_months == term_months,
-        MortgageRate.rate_date <= week_ago
-    ).order_by(desc(MortgageRate.rate_date)).first()
-
-    # Get all rates in period for volatility calculation
-    period_rates = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.term_months == term_months,
-        MortgageRate.rate_date >= period_start
-    ).order_by(MortgageRate.rate_date.asc()).all()
-
-    current_rate = current.rate
-    previous_rate = period_start_rate.rate if period_start_rate else current_rate
-    week_rate_val = week_rate.rate if week_rate else current_rate
+        MortgageRate.rate_type == model_rate_type,
+        MortgageRate.date <= week_ago
+    ).order_by(desc(MortgageRate.date)).first()
+
+    # Day-over-day changes across the period, computed in the database so
+    # only the final aggregate comes back instead of every row
+    daily_changes = db.session.query(
+        (
+            MortgageRate.rate
+            - func.lag(MortgageRate.rate).over(order_by=MortgageRate.date)
+        ).label('daily_change')
+    ).filter(
+        MortgageRate.rate_type == model_rate_type,
+        MortgageRate.date >= period_start
+    ).subquery()
+
+    # rate is a Numeric column; work in floats for the JSON response
+    current_rate = float(current.rate)
+    previous_rate = float(period_start_rate.rate) if period_start_rate else current_rate
+    week_rate_val = float(week_rate.rate) if week_rate else current_rate
 
     change = current_rate - previous_rate
     change_percent = (change / previous_rate * 100) if previous_rate else 0
@@ -260,27 +250,22 @@ def get_rate_trend():
     else:
         trend = 'stable'
 
-    # Calculate volatility (standard deviation of daily changes)
-    volatility = 0
-    if len(period_rates) > 1:
-        daily_changes = []
-        for i in range(1, len(period_rates)):
-            daily_changes.append(period_rates[i].rate - period_rates[i-1].rate)
-        if daily_changes:
-            avg_change = sum(daily_changes) / len(daily_changes)
-            variance = sum((c - avg_change) ** 2 for c in daily_changes) / len(daily_changes)
-            volatility = variance ** 0.5
+    # Calculate volatility (standard deviation of daily changes); the first
+    # row's change is NULL and ignored, so fewer than two rates gives 0
+    volatility = db.session.query(
+        func.stddev_pop(daily_changes.c.daily_change)
+    ).scalar()
+    volatility = float(volatility) if volatility is not None else 0
 
     return jsonify({
         'rate_type': rate_type,
-        'zip_code': zip_code,
         'current_rate': current_rate,
         'previous_rate': previous_rate,
         'change': round(change, 3),
         'change_percent': round(change_percent, 2),
         'trend': trend,
         'period_days': period,
-        'current_date': current.rate_date.strftime('%Y-%m-%d'),
+        'current_date': current.date.strftime('%Y-%m-%d'),
         'analysis': {
             'weekly_change': round(weekly_change, 3),
             'monthly_change': round(change, 3),
@@ -299,49 +284,54 @@ def export_rates_csv():
     Query params:
         rate_type (optional): Rate type or 'all'. Defaults to 'all'.
         days (optional): Number of days of history. Defaults to 365.
-        zip_code (optional): Filter by zip code. Defaults to national average.
 
     Response: CSV file download
     """
     rate_type = request.args.get('rate_type', 'all')
     days = request.args.get('days', 365, type=int)
-    zip_code = request.args.get('zip_code', '00000')
 
-    start_dt = datetime.now() - timedelta(days=days)
+    start_dt = date.today() - timedelta(days=days)
 
-    query = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.rate_date >= start_dt
-    )
+    query = MortgageRate.query.filter(MortgageRate.date >= start_dt)
 
     if rate_type != 'all':
-        term_months = get_term_months(rate_type)
-        query = query.filter(MortgageRate.term_months == term_months)
-
-    rates = query.order_by(MortgageRate.rate_date.asc(), MortgageRate.term_months.asc()).all()
-
-    # Generate CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['date', 'rate_type', 'term_months', 'rate', 'zip_code'])
-
-    for r in rates:
-        rate_type_str = TERM_TO_TYPE.get(r.term_months, f'{r.term_months}-month')
-        writer.writerow([
-            r.rate_date.strftime('%Y-%m-%d'),
-            rate_type_str,
-            r.term_months,
-            r.rate,
-            r.zip_code
-        ])
-
-    output.seek(0)
+        query = query.filter(
+            MortgageRate.rate_type == get_model_rate_type(rate_type)
+        )
+
+    rows = query.with_entities(
+        MortgageRate.date,
+        MortgageRate.rate_type,
+        MortgageRate.rate
+    ).order_by(
+        MortgageRate.date.asc(), MortgageRate.rate_type.asc()
+    ).yield_per(EXPORT_BATCH_SIZE)
+
+    def generate():
+        # Stream the CSV in chunks as rows arrive from the database instead
+        # of loading the full history and building the file in memory
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['date', 'rate_type', 'rate'])
+
+        for i, (rate_date, model_rate_type, rate) in enumerate(rows, 1):
+            writer.writerow([
+                rate_date.strftime('%Y-%m-%d'),
+                API_RATE_TYPES.get(model_rate_type, model_rate_type),
+                rate
+            ])
+            if i % EXPORT_BATCH_SIZE == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+
+        yield output.getvalue()
 
     return Response(
-        output.getvalue(),
+        stream_with_context(generate()),
         mimetype='text/csv',
         headers={
-            'Content-Disposition': f'attachment; filename=mortgage_rates_{zip_code}_{days}days.csv'
+            'Content-Disposition': f'attachment; filename=mortgage_rates_{days}days.csv'
         }
     )
 
@@ -356,16 +346,19 @@ def get_rate_types():
     Response:
         {
             "rate_types": [
-                {"id": "30-year-fixed", "term_months": 360, "description": "30-Year Fixed Rate"},
+                {"id": "30-year-fixed", "description": "30-Year Fixed Rate"},
                 ...
             ]
         }
     """
     rate_types = [
-        {'id': '30-year-fixed', 'term_months': 360, 'description': '30-Year Fixed Rate'},
-        {'id': '15-year-fixed', 'term_months': 180, 'description': '15-Year Fixed Rate'},
-        {'id': '20-year-fixed', 'term_months': 240, 'description': '20-Year Fixed Rate'},
-        {'id': '10-year-fixed', 'term_months': 120, 'description': '10-Year Fixed Rate'},
+        {'id': '30-year-fixed', 'description': '30-Year Fixed Rate'},
+        {'id': '15-year-fixed', 'description': '15-Year Fixed Rate'},
+        {'id': 'fha-30', 'description': '30-Year FHA Rate'},
+        {'id': 'va-30', 'description': '30-Year VA Rate'},
+        {'id': '5-1-arm', 'description': '5/1 Adjustable Rate'},
+        {'id': '7-1-arm', 'description': '7/1 Adjustable Rate'},
+        {'id': '10-1-arm', 'description': '10/1 Adjustable Rate'},
     ]
 
     return jsonify({'rate_types': rate_types})
@@ -31,8 +31,11 @@ def signup():
     """
     form = SignupForm()
     if form.validate_on_submit():
-        existing_user = User.query.filter_by(email=form.email.data).first()
-        if existing_user is None:
+        # Only existence matters here, so select the id alone
+        existing_user_id = db.session.query(User.id).filter_by(
+            email=form.email.data
+        ).scalar()
+        if existing_user_id is None:
             user = User(name=form.name.data, email=form.email.data)
             user.set_password(form.password.data)
             db.session.add(user)
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 import numpy_financial as npf
@@ -23,15 +25,22 @@ def total_payment(monthly_payment, term):
 
 def create_mortage_range(principal, term, rmax=0.1, rstep=0.00125):
     df = pd.DataFrame(data={'rate': np.arange(0, rmax + rstep, rstep)})
-    df['monthly_payment'] = df.apply(
-        lambda x: calc_loan_monthly_payment(principal, x['rate'], term), axis=1
-    )
-    df['total_payment'] = df.apply(
-        lambda x: total_payment(x['monthly_payment'], term), axis=1
-    )
+    df['monthly_payment'] = calc_loan_monthly_payments(principal, df['rate'], term)
+    df['total_payment'] = total_payment(df['monthly_payment'], term)
     return df
 
 
+def calc_loan_monthly_payments(principal, rates, term):
+    # Vectorized calc_loan_monthly_payment over an array of annual rates
+    r = np.asarray(rates, dtype=float) / 12
+    if term == 0:
+        return np.zeros_like(r)
+    growth = (1 + r) ** term
+    with np.errstate(divide='ignore', invalid='ignore'):
+        amortized = principal * (r * growth) / (growth - 1)
+    return np.where(r <= 0, principal / term, amortized)
+
+
 def find_target_interest_rate(principal, term, target_payment):
     df = create_mortage_range(principal, term, rmax=0.185, rstep=0.00125)
     idx = df.loc[df['monthly_payment'] < target_payment, 'monthly_payment'].idxmax()
@@ -86,9 +95,33 @@ def create_efficient_frontier(
     new_term,
     refi_cost,
 ):
+    # The frontier is a pure function of its inputs and is recomputed by the
+    # calculator whenever any control changes, so results are memoized; a
+    # copy is returned so callers can't modify the cached frame
+    return _create_efficient_frontier(
+        original_principal,
+        original_rate,
+        original_term,
+        current_principal,
+        term_remaining,
+        new_term,
+        refi_cost,
+    ).copy()
+
+
+@lru_cache(maxsize=128)
+def _create_efficient_frontier(
+    original_principal,
+    original_rate,
+    original_term,
+    current_principal,
+    term_remaining,
+    new_term,
+    refi_cost,
+):
 
     original_total_interest = ipmt_total(
-        original_rate, original_term, original_principal, get_per(original_term)
+        original_rate, original_term, original_principal
     )
 
     df = create_mortgage_table(original_principal, original_rate, original_term)
@@ -108,9 +141,7 @@ def create_efficient_frontier(
         axis=1,
     )
     df['total_new_interest'] = df.apply(
-        lambda x: ipmt_total(
-            x['interest_rate'], new_term, x['amount_remaining'], get_per(new_term)
-        ),
+        lambda x: ipmt_total(x['interest_rate'], new_term, x['amount_remaining']),
         axis=1,
     )
 
@@ -119,6 +150,10 @@ def create_efficient_frontier(
 
 def ipmt_total(rate, term, principal, per=None):
     if per is None:
+        # Interest over the full term is every payment less the principal,
+        # which avoids building and summing a per-period ipmt schedule
+        if rate >= 0 and term > 0:
+            return calc_loan_monthly_payment(principal, rate, term) * term - principal
         per = np.arange(term) + 1
     return -1 * np.sum(npf.ipmt(rate / 12, per, term, principal))
 
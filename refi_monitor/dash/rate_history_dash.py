@@ -13,21 +13,17 @@ from ..models import MortgageRate
 from .. import db
 
 
-# Rate type mappings
+# Map dashboard rate type ids to MortgageRate.rate_type values
 RATE_TYPE_MAP = {
-    '30-year-fixed': 360,
-    '15-year-fixed': 180,
-    '20-year-fixed': 240,
-    '10-year-fixed': 120,
+    '30-year-fixed': '30_year_fixed',
+    '15-year-fixed': '15_year_fixed',
 }
 
-TERM_TO_TYPE = {v: k for k, v in RATE_TYPE_MAP.items()}
+MODEL_TO_TYPE = {v: k for k, v in RATE_TYPE_MAP.items()}
 
 RATE_TYPE_COLORS = {
     '30-year-fixed': '#1f77b4',  # blue
     '15-year-fixed': '#2ca02c',  # green
-    '20-year-fixed': '#ff7f0e',  # orange
-    '10-year-fixed': '#9467bd',  # purple
 }
 
 
@@ -103,8 +99,6 @@ def init_rate_history_dashboard(server):
                                             options=[
                                                 {'label': ' 30-Year Fixed', 'value': '30-year-fixed'},
                                                 {'label': ' 15-Year Fixed', 'value': '15-year-fixed'},
-                                                {'label': ' 20-Year Fixed', 'value': '20-year-fixed'},
-                                                {'label': ' 10-Year Fixed', 'value': '10-year-fixed'},
                                             ],
                                             value=['30-year-fixed', '15-year-fixed'],
                                             labelStyle={'display': 'inline-block', 'margin-right': '15px'},
@@ -232,8 +226,6 @@ def init_rate_history_dashboard(server):
                                                                     options=[
                                                                         {'label': '30-Year Fixed', 'value': '30-year-fixed'},
                                                                         {'label': '15-Year Fixed', 'value': '15-year-fixed'},
-                                                                        {'label': '20-Year Fixed', 'value': '20-year-fixed'},
-                                                                        {'label': '10-Year Fixed', 'value': '10-year-fixed'},
                                                                     ],
                                                                     value='30-year-fixed',
                                                                     clearable=False,
@@ -292,53 +284,51 @@ depends on your loan size, remaining term, and closing costs.
     return dash_app.server
 
 
-def get_rate_data(rate_types, days, zip_code='00000'):
+def get_rate_data(rate_types, days):
     """Fetch rate data from database."""
-    start_date = datetime.now() - timedelta(days=days)
+    start_date = datetime.now().date() - timedelta(days=days)
 
-    term_months_list = [RATE_TYPE_MAP[rt] for rt in rate_types if rt in RATE_TYPE_MAP]
+    model_rate_types = [RATE_TYPE_MAP[rt] for rt in rate_types if rt in RATE_TYPE_MAP]
 
-    if not term_months_list:
+    if not model_rate_types:
         return pd.DataFrame()
 
-    rates = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.term_months.in_(term_months_list),
-        MortgageRate.rate_date >= start_date
-    ).order_by(MortgageRate.rate_date.asc()).all()
-
-    data = []
-    for r in rates:
-        data.append({
-            'date': r.rate_date,
-            'rate': r.rate,
-            'term_months': r.term_months,
-            'rate_type': TERM_TO_TYPE.get(r.term_months, f'{r.term_months}-month'),
-        })
+    rows = db.session.query(
+        MortgageRate.date, MortgageRate.rate, MortgageRate.rate_type
+    ).filter(
+        MortgageRate.rate_type.in_(model_rate_types),
+        MortgageRate.date >= start_date
+    ).order_by(MortgageRate.date.asc()).all()
+
+    # Build the frame column-wise from plain tuples rather than per-row dicts
+    df = pd.DataFrame(rows, columns=['date', 'rate', 'model_rate_type'])
+    df['date'] = pd.to_datetime(df['date'])
+    df['rate'] = df['rate'].astype(float)
+    # Types without a dashboard id keep their stored name
+    df['rate_type'] = df['model_rate_type'].map(MODEL_TO_TYPE).fillna(
+        df['model_rate_type']
+    )
 
-    return pd.DataFrame(data)
+    return df.drop(columns='model_rate_type')
 
 
-def get_current_rates(zip_code='00000'):
+def get_current_rates():
     """Get the most recent rates for all types."""
-    from sqlalchemy import func, desc
+    from sqlalchemy import func
 
-    latest_date = db.session.query(func.max(MortgageRate.rate_date)).filter(
-        MortgageRate.zip_code == zip_code
-    ).scalar()
+    latest_date = db.session.query(func.max(MortgageRate.date)).scalar()
 
     if not latest_date:
         return None, {}
 
-    rates = MortgageRate.query.filter(
-        MortgageRate.zip_code == zip_code,
-        MortgageRate.rate_date == latest_date
+    rates = db.session.query(MortgageRate.rate_type, MortgageRate.rate).filter(
+        MortgageRate.date == latest_date
     ).all()
 
     rates_dict = {}
-    for r in rates:
-        rate_type = TERM_TO_TYPE.get(r.term_months, f'{r.term_months}-month')
-        rates_dict[rate_type] = r.rate
+    for model_rate_type, rate in rates:
+        rate_type = MODEL_TO_TYPE.get(model_rate_type, model_rate_type)
+        rates_dict[rate_type] = float(rate)
 
     return latest_date, rates_dict
 
@@ -358,7 +348,7 @@ def init_rate_callbacks(dash_app):
             return html.P("No rate data available", className="text-muted")
 
         cards = []
-        for rate_type in ['30-year-fixed', '15-year-fixed', '20-year-fixed', '10-year-fixed']:
+        for rate_type in RATE_TYPE_MAP:
             if rate_type in rates:
                 cards.append(
                     dbc.Col(
@@ -51,6 +51,10 @@ class Mortgage(db.Model):
     trackings = db.relationship("Mortgage_Tracking")
     alerts = db.relationship("Alert")
 
+    __table_args__ = (
+        db.Index('idx_mortgage_user_id', 'user_id'),
+    )
+
 
 class Mortgage_Tracking(db.Model):
     __tablename__ = 'mortgage_current_value'
@@ -64,6 +68,11 @@ class Mortgage_Tracking(db.Model):
     updated_on = db.Column(db.DateTime, index=False, unique=False, nullable=True)
 
 
+# Alerts are evaluated and notified only in this payment status, which the
+# Stripe invoice webhook sets once the subscription is paid
+ACTIVE_PAYMENT_STATUS = 'active'
+
+
 class Alert(db.Model):
     __tablename__ = 'alert'
     id = db.Column(db.Integer, primary_key=True)
@@ -93,6 +102,11 @@ class Alert(db.Model):
     stripe_invoice_id = db.Column(db.String, index=False, unique=False, nullable=True)
     triggers = db.relationship("Trigger")
 
+    __table_args__ = (
+        db.Index('idx_alert_status_target_rate', 'payment_status', 'target_interest_rate'),
+        db.Index('idx_alert_mortgage_id', 'mortgage_id'),
+    )
+
 
 class Trigger(db.Model):
     __tablename__ = 'trigger'
@@ -108,6 +122,23 @@ class Trigger(db.Model):
     created_on = db.Column(db.DateTime, index=False, unique=False, nullable=True)
     updated_on = db.Column(db.DateTime, index=False, unique=False, nullable=True)
 
+    __table_args__ = (
+        db.Index(
+            'idx_trigger_alert_status_date',
+            'alert_id', 'alert_trigger_status', 'alert_trigger_date'
+        ),
+    )
+
+
+class ManualAlertCheck(db.Model):
+    """Status of an admin-queued alert check, shared by all app workers."""
+
+    __tablename__ = 'manual_alert_check'
+    id = db.Column(db.String(64), primary_key=True)  # scheduler job id
+    message = db.Column(db.Text, nullable=True)  # None while pending
+    created_on = db.Column(db.DateTime, nullable=False, index=True)
+    completed_on = db.Column(db.DateTime, nullable=True)
+
 
 class MortgageRate(db.Model):
     """Mortgage rate data model for tracking daily rates from MortgageNewsDaily."""
@@ -136,6 +167,7 @@ class MortgageRate(db.Model):
     __table_args__ = (
         db.UniqueConstraint('date', 'rate_type', name='uq_rate_date_type'),
         db.Index('idx_rate_date_type', 'date', 'rate_type'),
+        db.Index('idx_rate_type_date', 'rate_type', 'date'),
     )
 
     def __repr__(self):
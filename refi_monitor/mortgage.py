@@ -12,7 +12,7 @@ from flask import (
 from flask_login import current_user, login_user, login_required
 from . import login_manager
 from .forms import AddMortgageForm, AddAlertForm
-from .models import Mortgage, db, Alert, User
+from .models import ACTIVE_PAYMENT_STATUS, Mortgage, db, Alert, User
 from . import csrf
 from .notifications import send_payment_confirmation
 
@@ -141,7 +141,6 @@ def addalert():
     #     return redirect(url_for('main_bp.dashboard'))
     # print("pass m_id: ", m_id)
     m_id = request.args.get('m_id')
-    mortgage = Mortgage.query.filter_by(id=m_id).first()
     # if mortgage is None:
     #     return redirect(
     #         url_for('mortgage_bp.addmortgage', next=url_for('mortgage_bp.addalert'))
@@ -151,8 +150,10 @@ def addalert():
     # Validate login attempt
     if form.validate_on_submit():
         m_id = form.mortgage_id.data
-        mortgage = Mortgage.query.filter_by(id=m_id).first()
-        if m_id is None or mortgage is None or mortgage.user_id != current_user.id:
+        # The form validates m_id as a positive integer; get() checks the
+        # identity map before emitting a SELECT
+        mortgage = db.session.get(Mortgage, int(m_id))
+        if mortgage is None or mortgage.user_id != current_user.id:
             return redirect(url_for('main_bp.dashboard'))
 
         existing_alert = Alert.query.filter_by(
@@ -353,7 +354,7 @@ def alert_payment_webhook():
         ).first()
 
         if paid_alert:
-            paid_alert.payment_status = 'active'
+            paid_alert.payment_status = ACTIVE_PAYMENT_STATUS
             paid_alert.initial_payment = True
             paid_alert.initial_period_start = datalines['period']['start']
             paid_alert.initial_period_end = datalines['period']['end']
@@ -382,12 +383,15 @@ def alert_payment_webhook():
         m_id = datalines['metadata'].get('m_id')
 
         if alert_id and user_id and m_id:
-            failed_alert = Alert.query.filter_by(
+            # Flag the alert in a single UPDATE without loading it first
+            updated = Alert.query.filter_by(
                 mortgage_id=m_id, id=alert_id, user_id=user_id
-            ).first()
+            ).update(
+                {Alert.payment_status: 'payment_failed'},
+                synchronize_session=False
+            )
 
-            if failed_alert:
-                failed_alert.payment_status = 'payment_failed'
+            if updated:
                 db.session.commit()
 
         print(data)
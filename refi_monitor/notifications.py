@@ -1,10 +1,14 @@
 """Notification service for sending alerts to users."""
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app, render_template
 from flask_mail import Message
 from . import mail, db
-from .models import User, Alert, Mortgage, Trigger
+from .models import ACTIVE_PAYMENT_STATUS, User, Alert, Mortgage, Trigger
 from datetime import datetime
 
+# Concurrent SMTP sends when notifying a batch of triggers
+NOTIFICATION_WORKERS = 4
+
 
 def get_email_context(user=None, alert=None):
     """Get common context variables for email templates."""
@@ -18,81 +22,153 @@ def get_email_context(user=None, alert=None):
     }
 
 
-def send_alert_notification(trigger_id):
+def _load_trigger_rows(trigger_ids):
     """
-    Send email notification when an alert is triggered.
+    Load triggers with their alert, user and mortgage in one round trip.
 
-    Args:
-        trigger_id: ID of the Trigger record
+    Outer joins keep a trigger's row when a related record is missing.
+
+    Returns:
+        dict: {trigger_id: (trigger, alert, user, mortgage)}
     """
-    trigger = Trigger.query.get(trigger_id)
-    if not trigger:
+    rows = db.session.query(Trigger, Alert, User, Mortgage).outerjoin(
+        Alert, Alert.id == Trigger.alert_id
+    ).outerjoin(
+        User, User.id == Alert.user_id
+    ).outerjoin(
+        Mortgage, Mortgage.id == Alert.mortgage_id
+    ).filter(Trigger.id.in_(trigger_ids)).all()
+    return {row[0].id: row for row in rows}
+
+
+def _build_alert_message(trigger_id, row):
+    """
+    Build the notification email for a loaded trigger row.
+
+    Returns:
+        Message, or None if the trigger should not (or cannot) be notified
+    """
+    if not row:
         current_app.logger.error(f"Trigger {trigger_id} not found")
-        return False
+        return None
 
-    alert = Alert.query.get(trigger.alert_id)
+    trigger, alert, user, mortgage = row
     if not alert:
-        current_app.logger.error(f"Alert {alert.id} not found")
-        return False
+        current_app.logger.error(f"Alert {trigger.alert_id} not found")
+        return None
 
-    user = User.query.get(alert.user_id)
     if not user:
         current_app.logger.error(f"User {alert.user_id} not found")
-        return False
+        return None
 
-    mortgage = Mortgage.query.get(alert.mortgage_id)
     if not mortgage:
         current_app.logger.error(f"Mortgage {alert.mortgage_id} not found")
-        return False
+        return None
 
-    # Check if user has paid subscription
-    if not alert.payment_status or alert.payment_status != 'active':
+    # Check if user has paid subscription; the alert checks only trigger
+    # alerts in this same status
+    if alert.payment_status != ACTIVE_PAYMENT_STATUS:
         current_app.logger.info(f"Alert {alert.id} is not active, skipping notification")
+        return None
+
+    # Build email content
+    subject = f"RefiAlert: Refinancing Opportunity for {mortgage.name}"
+
+    # Get common email context
+    context = get_email_context(user=user, alert=alert)
+
+    # Add template-specific variables
+    context.update({
+        'user_name': user.name,
+        'mortgage_name': mortgage.name,
+        'alert_type': trigger.alert_type.replace('_', ' ').title(),
+        'trigger_reason': trigger.alert_trigger_reason,
+        'trigger_date': trigger.alert_trigger_date.strftime("%B %d, %Y at %I:%M %p") if trigger.alert_trigger_date else "N/A",
+        'remaining_principal': mortgage.remaining_principal,
+        'original_rate': mortgage.original_interest_rate,
+        'remaining_term': mortgage.remaining_term,
+        'target_monthly_payment': alert.target_monthly_payment,
+        'target_interest_rate': alert.target_interest_rate,
+        'target_term': alert.target_term
+    })
+
+    # Create HTML email body from template
+    html_body = render_template('email/alert_notification.html', **context)
+
+    # Create plain text version from template
+    text_body = render_template('email/alert_notification.txt', **context)
+
+    return Message(
+        subject=subject,
+        recipients=[user.email],
+        body=text_body,
+        html=html_body
+    )
+
+
+def _deliver(trigger_id, msg):
+    """Send a built notification email, logging the outcome."""
+    try:
+        mail.send(msg)
+        current_app.logger.info(f"Alert notification sent to {msg.recipients[0]} for trigger {trigger_id}")
+        return True
+    except Exception as e:
+        current_app.logger.error(f"Failed to send notification for trigger {trigger_id}: {str(e)}")
         return False
 
-    try:
-        # Build email content
-        subject = f"RefiAlert: Refinancing Opportunity for {mortgage.name}"
 
-        # Get common email context
-        context = get_email_context(user=user, alert=alert)
+def send_alert_notification(trigger_id):
+    """
+    Send email notification when an alert is triggered.
 
-        # Add template-specific variables
-        context.update({
-            'user_name': user.name,
-            'mortgage_name': mortgage.name,
-            'alert_type': trigger.alert_type.replace('_', ' ').title(),
-            'trigger_reason': trigger.alert_trigger_reason,
-            'trigger_date': trigger.alert_trigger_date.strftime("%B %d, %Y at %I:%M %p") if trigger.alert_trigger_date else "N/A",
-            'remaining_principal': mortgage.remaining_principal,
-            'original_rate': mortgage.original_interest_rate,
-            'remaining_term': mortgage.remaining_term,
-            'target_monthly_payment': alert.target_monthly_payment,
-            'target_interest_rate': alert.target_interest_rate,
-            'target_term': alert.target_term
-        })
+    Args:
+        trigger_id: ID of the Trigger record
 
-        # Create HTML email body from template
-        html_body = render_template('email/alert_notification.html', **context)
+    Returns:
+        bool: Whether the notification was sent
+    """
+    return send_alert_notifications([trigger_id]) == 1
 
-        # Create plain text version from template
-        text_body = render_template('email/alert_notification.txt', **context)
 
-        # Send email
-        msg = Message(
-            subject=subject,
-            recipients=[user.email],
-            body=text_body,
-            html=html_body
-        )
+def send_alert_notifications(trigger_ids):
+    """
+    Send notifications for a batch of triggers concurrently.
 
-        mail.send(msg)
-        current_app.logger.info(f"Alert notification sent to {user.email} for trigger {trigger_id}")
-        return True
+    Every trigger's alert, user and mortgage are loaded with one query and
+    the emails are built up front; only SMTP delivery, which dominates, is
+    spread over a small thread pool, each worker in its own app context.
 
-    except Exception as e:
-        current_app.logger.error(f"Failed to send notification for trigger {trigger_id}: {str(e)}")
-        return False
+    Args:
+        trigger_ids: IDs of committed Trigger records
+
+    Returns:
+        int: Number of notifications sent successfully
+    """
+    if not trigger_ids:
+        return 0
+
+    rows = _load_trigger_rows(trigger_ids)
+    messages = []
+    for trigger_id in trigger_ids:
+        try:
+            msg = _build_alert_message(trigger_id, rows.get(trigger_id))
+        except Exception as e:
+            current_app.logger.error(f"Failed to send notification for trigger {trigger_id}: {str(e)}")
+            continue
+        if msg is not None:
+            messages.append((trigger_id, msg))
+    if not messages:
+        return 0
+
+    app = current_app._get_current_object()
+
+    def send(item):
+        with app.app_context():
+            return _deliver(*item)
+
+    workers = min(NOTIFICATION_WORKERS, len(messages))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(1 for sent in executor.map(send, messages) if sent)
 
 
 def send_payment_confirmation(user_email, alert_id, payment_status):
@@ -1,22 +1,47 @@
+import os
+from functools import lru_cache
 from .models import Mortgage, db, Alert, Trigger
 from flask_login import current_user, login_user, login_required
 import numpy as np
 import pandas as pd
 import plotly
 import plotly.graph_objects as go
+import plotly.io as pio
 import plotly.express as px
 from .calc import *
 
 
+def _fig_payload(fig):
+    """
+    Serialize a figure for client-side rendering.
+
+    Templates load plotly.js once and draw each payload with Plotly.newPlot,
+    so the figure JSON is all that needs to be sent per plot.
+    """
+    return pio.to_json(fig, validate=False)
+
+
+RATE_HISTORY_CSV = "data/processed/20210911_mortgage_rate_daily_processed.csv"
+
+
 def time_target_plot(m_id):
-    mortgage = Mortgage.query.filter_by(id=m_id).first()
-    alert = Alert.query.filter_by(mortgage_id=m_id, initial_payment=True).first()
+    # Re-render only when the rate history file changes
+    return _time_target_payload(RATE_HISTORY_CSV, os.path.getmtime(RATE_HISTORY_CSV))
+
 
+@lru_cache(maxsize=4)
+def _time_target_payload(path, mtime):
     refi_rate = 0.0275
-    df = pd.read_csv("data/processed/20210911_mortgage_rate_daily_processed.csv")
+    df = pd.read_csv(path)
     # print(df)
     fig = go.Figure(
-        [go.Scatter(x=df['Date'], y=df.loc[df['type'] == '30 YR FRM', 'rate'])]
+        [
+            go.Scatter(
+                x=df['Date'],
+                y=df.loc[df['type'] == '30 YR FRM', 'rate'],
+                mode='lines',
+            )
+        ]
     )
     fig.add_shape(
         type='line',
@@ -35,15 +60,12 @@ def time_target_plot(m_id):
                 df.loc[df['type'] == '30 YR FRM', 'rate'].max() * 1.2,
             ]
         },
+        height=300,
+        width=600,
         paper_bgcolor="rgba(0, 0, 0, 0)",
         title="Tracking to Alert Target",
     )
-    return fig.to_html(
-        full_html=False,
-        default_height=300,
-        default_width=600,
-        config={'displayModeBar': False},
-    )
+    return _fig_payload(fig)
 
 
 def status_target_plot(m_id):
@@ -54,18 +76,86 @@ def status_target_interest_plot(m_id):
     False
 
 
-def status_target_payment_plot(m_id):
-    mortgage = Mortgage.query.filter_by(id=m_id).first()
-    alert = Alert.query.filter_by(mortgage_id=m_id, initial_payment=True).first()
+def time_target_plot_bulk(m_ids):
+    """
+    Build time_target_plot for several mortgages at once.
+
+    The chart doesn't depend on the mortgage yet, so the rate history is read
+    and rendered once and shared by every id.
+    """
+    if not m_ids:
+        return {}
+    return dict.fromkeys(m_ids, time_target_plot(None))
+
+
+def status_target_payment_plot(mortgage):
+    """
+    Build the status plot for an already loaded mortgage.
+
+    Only its initial-payment alert is queried; returns None if there is none.
+    """
+    alert = Alert.query.filter_by(
+        mortgage_id=mortgage.id, initial_payment=True
+    ).order_by(Alert.id).first()
+    if alert is None:
+        return None
+    return _status_target_payment_figure(mortgage, alert)
 
+
+def status_target_payment_plot_bulk(m_ids):
+    """
+    Build status_target_payment_plot for several mortgages at once.
+
+    Mortgages and their initial-payment alerts are fetched with one query
+    each instead of two queries per mortgage.
+    """
+    if not m_ids:
+        return {}
+    mortgages = {
+        m.id: m for m in Mortgage.query.filter(Mortgage.id.in_(m_ids)).all()
+    }
+    alerts = {}
+    for a in Alert.query.filter(
+        Alert.mortgage_id.in_(m_ids), Alert.initial_payment == True
+    ).order_by(Alert.id):
+        alerts.setdefault(a.mortgage_id, a)
+    return {
+        m_id: _status_target_payment_figure(mortgages[m_id], alerts[m_id])
+        for m_id in m_ids
+        if m_id in mortgages and m_id in alerts
+    }
+
+
+def _status_target_payment_figure(mortgage, alert):
+    return _status_target_payment_payload(
+        mortgage.remaining_principal,
+        mortgage.original_principal,
+        mortgage.original_interest_rate,
+        mortgage.original_term,
+        alert.target_term,
+        alert.target_monthly_payment,
+    )
+
+
+# Gauges only change when the mortgage or alert inputs do, so rendered
+# payloads are memoized on those values
+@lru_cache(maxsize=256)
+def _status_target_payment_payload(
+    remaining_principal,
+    original_principal,
+    original_interest_rate,
+    original_term,
+    target_term,
+    target_monthly_payment,
+):
     refi_rate = 0.01
     refi_monthly_payment = calc_loan_monthly_payment(
-        mortgage.remaining_principal, refi_rate, alert.target_term * 12
+        remaining_principal, refi_rate, target_term * 12
     )
     current_monthly_payment = calc_loan_monthly_payment(
-        mortgage.original_principal,
-        mortgage.original_interest_rate / 100,
-        mortgage.original_term,
+        original_principal,
+        original_interest_rate / 100,
+        original_term,
     )
     fig = go.Figure(
         go.Indicator(
@@ -73,7 +163,7 @@ def status_target_payment_plot(m_id):
             value=refi_monthly_payment,
             domain={'x': [0, 1], 'y': [0, 1]},
             delta={
-                'reference': alert.target_monthly_payment,
+                'reference': target_monthly_payment,
                 'position': "top",
                 'decreasing_color': "#0ead69",
                 'increasing_color': "#e63946",
@@ -86,21 +176,21 @@ def status_target_payment_plot(m_id):
                 'shape': "bullet",
                 'axis': {
                     'range': [
-                        0.75 * alert.target_monthly_payment,
+                        0.75 * target_monthly_payment,
                         current_monthly_payment * 1.25,
                     ]
                 },
                 'threshold': {
                     'line': {'color': "#ff9e00", 'width': 2},
                     'thickness': 0.75,
-                    'value': alert.target_monthly_payment,
+                    'value': target_monthly_payment,
                 },
                 'bgcolor': "white",
                 'steps': [
                     {
                         'range': [
-                            0.75 * alert.target_monthly_payment,
-                            alert.target_monthly_payment,
+                            0.75 * target_monthly_payment,
+                            target_monthly_payment,
                         ],
                         'color': "#0ead69",
                     },
@@ -133,10 +223,4 @@ def status_target_payment_plot(m_id):
         yaxis=dict(tickprefix='$', tickformat=',.'),
         xaxis=dict(tickprefix='$', tickformat=',.'),
     )
-    print("made the plot!")
-    return fig.to_html(
-        full_html=False,
-        default_height=250,
-        default_width=600,
-        config={'displayModeBar': False},
-    )
+    return _fig_payload(fig)
@@ -1,17 +1,110 @@
 """Rate updater module for fetching and updating mortgage rates."""
 import logging
-from datetime import datetime
-from typing import Dict, List
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 import requests
-from .models import Mortgage_Tracking, Alert, Trigger, Mortgage
+from sqlalchemy import func, insert, select, update
+from .models import (
+    ACTIVE_PAYMENT_STATUS, Mortgage_Tracking, Alert, Trigger, Mortgage, MortgageRate
+)
+from .notifications import send_alert_notifications
 from . import db
 
 logger = logging.getLogger(__name__)
 
 
+def get_recent_market_rates(
+    rate_types: List[str], depth: int = 2
+) -> Dict[str, Tuple[Tuple[float, date], ...]]:
+    """
+    Get the most recent market rates for several rate types in one query.
+
+    Rates are ranked per rate type by date with a window function, so the
+    latest and previous rates for every type come back in a single round
+    trip.
+
+    Args:
+        rate_types: MortgageRate rate types (e.g., ['30_year_fixed', '15_year_fixed'])
+        depth: Number of most recent dates to return per rate type
+
+    Returns:
+        Dict mapping each rate type to a tuple of (rate, date), newest first,
+        with rates as decimals (6.875% -> 0.06875); the tuple is empty if no
+        rate data exists for that type
+    """
+    # (date, rate_type) is unique, so ranking rows by date within each rate
+    # type yields one row per rank
+    date_rank = func.row_number().over(
+        partition_by=MortgageRate.rate_type,
+        order_by=MortgageRate.date.desc()
+    ).label('date_rank')
+    ranked = select(
+        MortgageRate.rate_type, MortgageRate.rate, MortgageRate.date, date_rank
+    ).where(MortgageRate.rate_type.in_(rate_types)).subquery()
+
+    rows = db.session.execute(
+        select(
+            ranked.c.rate_type, ranked.c.rate, ranked.c.date
+        ).where(ranked.c.date_rank <= depth).order_by(
+            ranked.c.rate_type, ranked.c.date_rank
+        )
+    ).all()
+
+    recent = {rate_type: [] for rate_type in rate_types}
+    for rate_type, rate, rate_date in rows:
+        recent[rate_type].append((float(rate) / 100, rate_date))
+    return {rate_type: tuple(rates) for rate_type, rates in recent.items()}
+
+
+# An alert that fired successfully within this window doesn't fire again
+ALERT_COOLDOWN = timedelta(hours=24)
+
+
+def alert_in_cooldown(now: datetime):
+    """
+    SQL predicate that is true for alerts in their trigger cooldown.
+
+    Correlates on Alert.id, so it can be used (or negated) directly in a
+    query over Alert. Every alert check shares it, so they always agree on
+    whether an alert may fire.
+
+    Args:
+        now: Timestamp of the check run (naive UTC, like alert_trigger_date)
+    """
+    return select(Trigger.id).where(
+        Trigger.alert_id == Alert.id,
+        Trigger.alert_trigger_status == 1,  # Successful trigger
+        Trigger.alert_trigger_date > now - ALERT_COOLDOWN,
+    ).exists()
+
+
+# How long fetched rates are reused. Short enough that each scheduled job
+# (hours apart) fetches fresh rates, long enough to absorb bursts of
+# lookups such as a manual check right after a scheduled one
+RATES_CACHE_TTL = timedelta(minutes=10)
+
+# (fetched at, rates) from the last successful
+# RateFetcher.fetch_current_rates call. Module level so every RateFetcher
+# in the process shares it.
+_rates_cache: Optional[Tuple[datetime, Dict[str, float]]] = None
+
+# Random source for the mock rate feed
+_rng = random.Random()
+
+
 class RateFetcher:
     """Fetches current mortgage rates from external API."""
 
+    # Base rates the mock feed varies around
+    MOCK_BASE_RATES = (
+        ('30 YR FRM', 0.0294),
+        ('15 YR FRM', 0.0245),
+        ('5/1 YR ARM', 0.0268),
+        ('FHA 30 YR', 0.0285),
+        ('JUMBO 30 YR', 0.0305),
+    )
+
     def __init__(self):
         # TODO: Replace with actual API configuration
         # Options: Freddie Mac API, Mortgage News Daily, etc.
@@ -22,6 +115,9 @@ class RateFetcher:
         """
         Fetch current mortgage rates from external source.
 
+        Results are reused for RATES_CACHE_TTL, so back-to-back lookups
+        share one request while every scheduled run sees current rates.
+
         Returns:
             Dict mapping rate types to current rates (as decimals, e.g., 0.0294 = 2.94%)
             Example: {'30 YR FRM': 0.0294, '15 YR FRM': 0.0245, ...}
@@ -29,6 +125,17 @@ class RateFetcher:
         TODO: Implement actual API integration
         Current implementation returns mock data for testing.
         """
+        global _rates_cache
+        now = datetime.utcnow()
+        if _rates_cache is not None and now - _rates_cache[0] < RATES_CACHE_TTL:
+            return dict(_rates_cache[1])
+
+        rates = self._fetch_rates()
+        _rates_cache = (now, rates)
+        return dict(rates)
+
+    def _fetch_rates(self) -> Dict[str, float]:
+        """Fetch rates from the external source, bypassing the cache."""
         # TODO: Replace this mock implementation with actual API call
         # Example with Freddie Mac:
         # response = requests.get(
@@ -38,19 +145,11 @@ class RateFetcher:
         # return self._parse_api_response(response.json())
 
         # Mock data for testing (simulates small rate changes)
-        import random
-        base_rates = {
-            '30 YR FRM': 0.0294,
-            '15 YR FRM': 0.0245,
-            '5/1 YR ARM': 0.0268,
-            'FHA 30 YR': 0.0285,
-            'JUMBO 30 YR': 0.0305
-        }
-
         # Add small random variation (-0.05% to +0.05%)
+        uniform = _rng.uniform
         return {
-            rate_type: round(rate + random.uniform(-0.0005, 0.0005), 5)
-            for rate_type, rate in base_rates.items()
+            rate_type: round(rate + uniform(-0.0005, 0.0005), 5)
+            for rate_type, rate in self.MOCK_BASE_RATES
         }
 
 
@@ -83,110 +182,108 @@ class RateUpdater:
             logger.error("Primary rate (30 YR FRM) not found in fetched rates")
             raise ValueError("Primary rate not available")
 
-        # Update all mortgage tracking records
-        tracking_records = Mortgage_Tracking.query.all()
-        updated_count = 0
-
-        for record in tracking_records:
-            try:
-                # Update the current rate
-                record.current_rate = primary_rate
-                record.updated_on = datetime.utcnow()
-                updated_count += 1
-                logger.debug(f"Updated mortgage_id={record.mortgage_id} to rate={primary_rate}")
-            except Exception as e:
-                logger.error(f"Failed to update record {record.id}: {e}")
-                continue
+        # One timestamp for the run, so the tracking rows and the triggers
+        # written below carry the same time
+        now = datetime.utcnow()
 
-        db.session.commit()
-        logger.info(f"Updated {updated_count} mortgage tracking records")
+        # The tracking update and the alert triggers are written in one
+        # transaction, so a run either lands completely or not at all
+        try:
+            # Update all mortgage tracking records in a single UPDATE statement
+            result = db.session.execute(
+                update(Mortgage_Tracking)
+                .values(current_rate=primary_rate, updated_on=now)
+                .execution_options(synchronize_session=False)
+            )
+            updated_count = result.rowcount
+            logger.info(f"Updated {updated_count} mortgage tracking records")
+
+            # Check alerts and stage triggers for those that fire
+            new_trigger_ids = self._check_and_trigger_alerts(primary_rate, now)
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
 
-        # Check alerts and trigger notifications
-        alerts_triggered = self._check_and_trigger_alerts(primary_rate)
+        # Notify only once the triggers are committed, so slow mail delivery
+        # never holds the transaction open and a failed send can't roll back
+        # the trigger records
+        self._send_notifications(new_trigger_ids)
 
         return {
             'updated': updated_count,
-            'alerts_triggered': alerts_triggered,
+            'alerts_triggered': len(new_trigger_ids),
             'current_rate': primary_rate
         }
 
-    def _check_and_trigger_alerts(self, current_rate: float) -> int:
+    def _check_and_trigger_alerts(
+        self, current_rate: float, now: Optional[datetime] = None
+    ) -> List[int]:
         """
         Check all active alerts and create triggers for those meeting conditions.
 
+        The triggers are inserted but not committed; the caller owns the
+        transaction.
+
         Args:
             current_rate: Current mortgage rate to check against
+            now: Timestamp of the run (defaults to the current UTC time)
 
         Returns:
-            Number of alerts triggered
+            IDs of the Trigger records created
         """
-        # Get all active alerts (those with paid status and target rates)
-        # payment_status can be 'paid', 'unpaid', etc.
-        active_alerts = Alert.query.filter(
-            Alert.payment_status == 'paid',
-            Alert.target_interest_rate.isnot(None)
+        # One timestamp for the whole batch; the same value drives the
+        # cooldown check and stamps every trigger created below
+        if now is None:
+            now = datetime.utcnow()
+
+        # Get all active alerts (those with a paid subscription and a target
+        # rate) whose target is met by the current rate and that are out of
+        # cooldown. The status matches what notifications require, so every
+        # trigger created here can be emailed. Only the columns needed to
+        # build triggers are selected, so no Alert instances are hydrated.
+        eligible_alerts = db.session.execute(
+            select(Alert.id, Alert.target_interest_rate, Alert.alert_type).where(
+                Alert.payment_status == ACTIVE_PAYMENT_STATUS,
+                Alert.target_interest_rate.isnot(None),
+                Alert.target_interest_rate >= current_rate,
+                ~alert_in_cooldown(now),
+            )
         ).all()
-
-        triggered_count = 0
-
-        for alert in active_alerts:
-            # Check if current rate meets or is below target rate
-            if current_rate <= alert.target_interest_rate:
-                # Check if we haven't already triggered this alert recently
-                recent_trigger = Trigger.query.filter(
-                    Trigger.alert_id == alert.id,
-                    Trigger.alert_trigger_status == 1  # Successful trigger
-                ).order_by(Trigger.alert_trigger_date.desc()).first()
-
-                # Only trigger if no recent trigger or rate has changed significantly
-                should_trigger = True
-                if recent_trigger:
-                    # Don't re-trigger if already triggered in last 24 hours
-                    # unless rate has dropped by at least 0.1%
-                    hours_since_trigger = (
-                        datetime.utcnow() - recent_trigger.alert_trigger_date
-                    ).total_seconds() / 3600
-
-                    if hours_since_trigger < 24:
-                        should_trigger = False
-
-                if should_trigger:
-                    # Create trigger record
-                    trigger = Trigger(
-                        alert_id=alert.id,
-                        alert_type=alert.alert_type,
-                        alert_trigger_status=1,  # Success
-                        alert_trigger_reason=f"Rate {current_rate:.4f} met target {alert.target_interest_rate:.4f}",
-                        alert_trigger_date=datetime.utcnow(),
-                        created_on=datetime.utcnow(),
-                        updated_on=datetime.utcnow()
-                    )
-                    db.session.add(trigger)
-                    triggered_count += 1
-
-                    # TODO: Send notification to user
-                    # self._send_notification(alert, current_rate)
-                    logger.info(f"Alert {alert.id} triggered for rate {current_rate}")
-
-        db.session.commit()
-        logger.info(f"Triggered {triggered_count} alerts")
-
-        return triggered_count
-
-    def _send_notification(self, alert: Alert, current_rate: float):
+        if not eligible_alerts:
+            logger.info("No alerts to trigger")
+            return []
+
+        # Create every trigger record in a single multi-row INSERT
+        new_trigger_ids = db.session.execute(
+            insert(Trigger).values([
+                {
+                    'alert_id': alert_id,
+                    'alert_type': alert_type,
+                    'alert_trigger_status': 1,  # Success
+                    'alert_trigger_reason': f"Rate {current_rate:.4f} met target {target_interest_rate:.4f}",
+                    'alert_trigger_date': now,
+                    'created_on': now,
+                    'updated_on': now,
+                }
+                for alert_id, target_interest_rate, alert_type in eligible_alerts
+            ]).returning(Trigger.id)
+        ).scalars().all()
+
+        for alert_id, _, _ in eligible_alerts:
+            logger.info(f"Alert {alert_id} triggered for rate {current_rate}")
+
+        logger.info(f"Triggered {len(new_trigger_ids)} alerts")
+
+        return new_trigger_ids
+
+    def _send_notifications(self, trigger_ids: List[int]):
         """
-        Send notification to user about triggered alert.
+        Send notifications for committed triggers.
 
         Args:
-            alert: The Alert that was triggered
-            current_rate: Current rate that triggered the alert
-
-        TODO: Implement email/SMS/webhook notification
+            trigger_ids: IDs of triggers created by the current alert check
         """
-        # TODO: Implement notification logic
-        # Options:
-        # - Email via Flask-Mail
-        # - SMS via Twilio
-        # - Webhook POST to user-configured URL
-        # - Push notification
-        pass
+        sent = send_alert_notifications(trigger_ids)
+        logger.info(f"Sent {sent} of {len(trigger_ids)} alert notifications")
@@ -1,17 +1,24 @@
 """Routes for parent Flask app."""
+import hashlib
 import os
-from functools import wraps
+from functools import lru_cache, wraps
 from datetime import datetime, timedelta
-from flask import render_template, jsonify, abort
+from flask import render_template, jsonify, abort, request, Response
 from flask import current_app as app
 from flask import send_from_directory
 from flask import Blueprint, render_template, redirect, url_for
 from flask_login import current_user, login_required, logout_user
-from .models import Mortgage, Alert, MortgageRate
+from .models import Mortgage, Alert
 from .plots import *
-from .scheduler import trigger_manual_check
+from .scheduler import (
+    get_manual_check_status,
+    queue_manual_check,
+    trigger_manual_check,
+)
+from .rate_updater import get_recent_market_rates
 from . import db
 from sqlalchemy import func
+from sqlalchemy.orm import contains_eager
 
 
 def admin_required(f):
@@ -24,10 +31,14 @@ def admin_required(f):
     return decorated_function
 
 
-def get_mortgage_overview(user_id):
+def get_mortgage_overview(user_id, mortgages=None):
     """
     Calculate overview metrics for the user's mortgages.
 
+    Pass mortgages when the caller has already loaded the user's mortgages
+    to avoid querying them again; otherwise the totals are aggregated in SQL
+    without loading the rows.
+
     Returns dict with:
         - total_mortgages: count of user's mortgages
         - total_principal: sum of remaining principal
@@ -37,47 +48,48 @@ def get_mortgage_overview(user_id):
         - rate_change_30yr: change from previous rate (positive = up)
         - potential_savings: estimated monthly savings if refinancing
     """
-    # Get user's mortgages
-    mortgages = Mortgage.query.filter_by(user_id=user_id).all()
-
-    if not mortgages:
+    if mortgages is None:
+        # Count and sum the user's mortgages in a single aggregate query
+        total_mortgages, total_principal, weighted_rate_sum = db.session.query(
+            func.count(Mortgage.id),
+            func.coalesce(func.sum(Mortgage.remaining_principal), 0),
+            func.coalesce(
+                func.sum(Mortgage.original_interest_rate * Mortgage.remaining_principal), 0
+            ),
+        ).filter(Mortgage.user_id == user_id).one()
+    else:
+        total_mortgages = len(mortgages)
+
+        # Sum principal and principal-weighted rate in a single pass
+        total_principal = 0
+        weighted_rate_sum = 0
+        for m in mortgages:
+            principal = m.remaining_principal
+            total_principal += principal
+            weighted_rate_sum += m.original_interest_rate * principal
+
+    if not total_mortgages:
         return None
 
-    total_mortgages = len(mortgages)
-    total_principal = sum(m.remaining_principal for m in mortgages)
-
-    # Calculate weighted average rate (weighted by principal)
-    weighted_rate_sum = sum(
-        m.original_interest_rate * m.remaining_principal
-        for m in mortgages
-    )
     avg_user_rate = weighted_rate_sum / total_principal if total_principal > 0 else 0
 
     # Get latest market rates from MortgageRate table
-    # Look for most recent 30-year (360 months) and 15-year (180 months) rates
-    latest_30yr = MortgageRate.query.filter_by(term_months=360).order_by(
-        MortgageRate.rate_date.desc()
-    ).first()
-
-    latest_15yr = MortgageRate.query.filter_by(term_months=180).order_by(
-        MortgageRate.rate_date.desc()
-    ).first()
-
-    # Get previous 30yr rate for change calculation
-    previous_30yr = None
-    if latest_30yr:
-        previous_30yr = MortgageRate.query.filter(
-            MortgageRate.term_months == 360,
-            MortgageRate.rate_date < latest_30yr.rate_date
-        ).order_by(MortgageRate.rate_date.desc()).first()
-
-    current_30yr_rate = latest_30yr.rate if latest_30yr else 0.0650  # Default fallback
-    current_15yr_rate = latest_15yr.rate if latest_15yr else 0.0580  # Default fallback
+    # Look for the two most recent 30-year fixed rates, for the change
+    # calculation, and the most recent 15-year fixed rate
+    recent_rates = get_recent_market_rates(['30_year_fixed', '15_year_fixed'])
+    rates_30yr = recent_rates['30_year_fixed']
+    rates_15yr = recent_rates['15_year_fixed']
+    latest_30yr = rates_30yr[0] if rates_30yr else None
+    latest_15yr = rates_15yr[0] if rates_15yr else None
+    previous_30yr = rates_30yr[1][0] if len(rates_30yr) > 1 else None
+
+    current_30yr_rate = latest_30yr[0] if latest_30yr else 0.0650  # Default fallback
+    current_15yr_rate = latest_15yr[0] if latest_15yr else 0.0580  # Default fallback
 
     # Calculate rate change
     rate_change_30yr = 0
-    if latest_30yr and previous_30yr:
-        rate_change_30yr = latest_30yr.rate - previous_30yr.rate
+    if latest_30yr and previous_30yr is not None:
+        rate_change_30yr = latest_30yr[0] - previous_30yr
 
     # Estimate potential savings (simplified calculation)
     # If user's average rate > current 30yr rate, calculate monthly savings
@@ -95,9 +107,86 @@ def get_mortgage_overview(user_id):
         'current_15yr_rate': current_15yr_rate * 100,
         'rate_change_30yr': rate_change_30yr * 100,  # basis points style
         'potential_savings': potential_savings,
-        'rate_date': latest_30yr.rate_date if latest_30yr else None
+        'rate_date': latest_30yr[1] if latest_30yr else None
     }
 
+
+# Alert columns read by the dashboard and manage templates
+ALERT_DISPLAY_COLUMNS = (
+    Alert.id,
+    Alert.mortgage_id,
+    Alert.alert_type,
+    Alert.target_monthly_payment,
+    Alert.target_interest_rate,
+    Alert.target_term,
+    Alert.estimate_refinance_cost,
+    Alert.initial_payment,
+    Alert.payment_status,
+)
+
+
+def get_mortgage_alerts(user_id, with_plots=True):
+    """
+    Load a user's mortgages with their paid alerts and rendered plots.
+
+    Alerts are loaded together with the mortgages in a single joined query
+    and plots are built in one batch. Pass with_plots=False when the
+    page fetches its plots from the plot endpoints instead; the plot slots
+    are then None.
+
+    Returns tuple of:
+        - mortgages: list of the user's Mortgage rows
+        - alerts: list of their alerts with an initial payment
+        - mortgage_alerts: [mortgage, alert, status_plot, time_plot] rows for
+          the templates; mortgages without alerts get [mortgage, None, None, None]
+    """
+    # Mortgages and their paid alerts come back from one LEFT OUTER JOIN.
+    # Alerts carry a dozen Stripe billing columns the pages never read, so
+    # only the columns the templates and plots use are fetched
+    mortgages = Mortgage.query.outerjoin(
+        Alert, db.and_(Alert.mortgage_id == Mortgage.id, Alert.initial_payment == True)
+    ).options(
+        contains_eager(Mortgage.alerts).load_only(*ALERT_DISPLAY_COLUMNS)
+    ).filter(Mortgage.user_id == user_id).order_by(Mortgage.id, Alert.id).all()
+
+    alerts_by_mortgage = {}
+    for m in mortgages:
+        m_alerts = m.alerts
+        if m_alerts:
+            alerts_by_mortgage[m.id] = m_alerts
+    alerts = [a for m_alerts in alerts_by_mortgage.values() for a in m_alerts]
+
+    # Render every mortgage's plots in one batch
+    if with_plots:
+        status_plots = status_target_payment_plot_bulk(list(alerts_by_mortgage))
+        time_plots = time_target_plot_bulk(list(alerts_by_mortgage))
+    else:
+        status_plots = time_plots = {}
+
+    mortgage_alerts = []
+    for m in mortgages:
+        m_alerts = alerts_by_mortgage.get(m.id)
+        if not m_alerts:
+            mortgage_alerts.append([m, None, None, None])
+            continue
+        for a in m_alerts:
+            mortgage_alerts.append(
+                [m, a, status_plots.get(m.id), time_plots.get(m.id)]
+            )
+
+    return mortgages, alerts, mortgage_alerts
+
+
+def _get_user_mortgage_or_404(mortgage_id):
+    return Mortgage.query.filter_by(
+        id=mortgage_id, user_id=current_user.id
+    ).first_or_404()
+
+
+# Browser cache lifetime for the favicon, in seconds (one day). The URL is
+# unversioned, so after this the icon is revalidated against its ETag
+FAVICON_MAX_AGE = 60 * 60 * 24
+
 # Blueprint Configuration
 main_bp = Blueprint(
     'main_bp', __name__, template_folder='templates', static_folder='static'
@@ -119,6 +208,14 @@ main_bp = Blueprint(
 @main_bp.route('/setalert/')
 def setalert():
     """Set alert page"""
+    if app.debug:
+        return _render_setalert.__wrapped__()
+    return _render_setalert()
+
+
+@lru_cache(maxsize=1)
+def _render_setalert():
+    # The page has no per-request content, so it is rendered once
     return render_template(
         'setalert.jinja2',
         title='Set Refinance Alert',
@@ -130,11 +227,22 @@ def setalert():
 
 @main_bp.route('/favicon.ico')
 def favicon():
-    return send_from_directory(
-        os.path.join(app.root_path, 'static'),
-        'favicon.ico',
-        mimetype='image/vnd.microsoft.icon',
-    )
+    body, etag = _favicon_body(os.path.join(app.root_path, 'static', 'favicon.ico'))
+    response = Response(body, mimetype='image/vnd.microsoft.icon')
+    response.set_etag(etag)
+    # Let browsers and CDNs keep the icon for a day, then revalidate
+    response.cache_control.public = True
+    response.cache_control.max_age = FAVICON_MAX_AGE
+    # Answers If-None-Match revalidations with an empty 304
+    return response.make_conditional(request)
+
+
+@lru_cache(maxsize=1)
+def _favicon_body(path):
+    """Read the favicon once and compute its ETag."""
+    with open(path, 'rb') as f:
+        body = f.read()
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
 
 
 @main_bp.route('/health')
@@ -144,8 +252,10 @@ def health_check():
     Returns 200 if app is healthy, 503 if database is unreachable.
     """
     try:
-        # Check database connectivity
-        db.session.execute(db.text('SELECT 1'))
+        # Check database connectivity on a pooled connection directly,
+        # bypassing the ORM session and its transaction bookkeeping
+        with db.engine.connect() as conn:
+            conn.exec_driver_sql('SELECT 1').scalar()
         return jsonify({
             'status': 'healthy',
             'database': 'connected',
@@ -165,25 +275,13 @@ def health_check():
 def dashboard():
     """Logged-in User Dashboard."""
 
-    mortgages = Mortgage.query.filter_by(user_id=current_user.id)
-    alerts = Alert.query.filter(
-        Alert.mortgage_id.in_([m.id for m in mortgages]), Alert.initial_payment == True
+    # Plots are fetched by the page from the plot endpoints after it renders
+    mortgages, alerts, mortgage_alerts = get_mortgage_alerts(
+        current_user.id, with_plots=False
     )
 
-    mortgage_alerts = []
-    for m in mortgages:
-        matched = 0
-        for a in alerts:
-            if m.id == a.mortgage_id:
-                mortgage_alerts.append(
-                    [m, a, status_target_payment_plot(m.id), time_target_plot(m.id)]
-                )
-                matched += 1
-        if matched == 0:
-            mortgage_alerts.append([m, None, None, None])
-
-    # Get mortgage overview metrics
-    overview = get_mortgage_overview(current_user.id)
+    # Get mortgage overview metrics from the mortgages already loaded
+    overview = get_mortgage_overview(current_user.id, mortgages)
 
     return render_template(
         'dashboard.jinja2',
@@ -198,26 +296,31 @@ def dashboard():
     )
 
 
+@main_bp.route('/api/plots/status/<int:mortgage_id>', methods=['GET'])
+@login_required
+def status_plot(mortgage_id):
+    """Status plot JSON for one of the current user's mortgages."""
+    # The ownership check already loaded the mortgage; reuse it for the plot
+    mortgage = _get_user_mortgage_or_404(mortgage_id)
+    payload = status_target_payment_plot(mortgage)
+    if payload is None:
+        abort(404)
+    return Response(payload, mimetype='application/json')
+
+
+@main_bp.route('/api/plots/time/<int:mortgage_id>', methods=['GET'])
+@login_required
+def time_plot(mortgage_id):
+    """Time plot JSON for one of the current user's mortgages."""
+    _get_user_mortgage_or_404(mortgage_id)
+    return Response(time_target_plot(mortgage_id), mimetype='application/json')
+
+
 @main_bp.route('/v2', methods=['GET'])
 @login_required
 def dashboard_v2():
     """Modern Dashboard V2 - New layout with component structure."""
-    mortgages = Mortgage.query.filter_by(user_id=current_user.id)
-    alerts = Alert.query.filter(
-        Alert.mortgage_id.in_([m.id for m in mortgages]), Alert.initial_payment == True
-    )
-
-    mortgage_alerts = []
-    for m in mortgages:
-        matched = 0
-        for a in alerts:
-            if m.id == a.mortgage_id:
-                mortgage_alerts.append(
-                    [m, a, status_target_payment_plot(m.id), time_target_plot(m.id)]
-                )
-                matched += 1
-        if matched == 0:
-            mortgage_alerts.append([m, None, None, None])
+    mortgages, alerts, mortgage_alerts = get_mortgage_alerts(current_user.id)
 
     return render_template(
         'dashboard_v2.jinja2',
@@ -236,23 +339,10 @@ def dashboard_v2():
 def manage():
     """Logged-in User Dashboard."""
 
-    mortgages = Mortgage.query.filter_by(user_id=current_user.id)
-    alerts = Alert.query.filter(
-        Alert.mortgage_id.in_([m.id for m in mortgages]), Alert.initial_payment == True
+    mortgages, alerts, mortgage_alerts = get_mortgage_alerts(
+        current_user.id, with_plots=False
     )
 
-    mortgage_alerts = []
-    for m in mortgages:
-        matched = 0
-        for a in alerts:
-            if m.id == a.mortgage_id:
-                mortgage_alerts.append(
-                    [m, a, status_target_payment_plot(m.id), time_target_plot(m.id)]
-                )
-                matched += 1
-        if matched == 0:
-            mortgage_alerts.append([m, None, None, None])
-
     return render_template(
         'manage.jinja2',
         title='Refinance Monitor Management',
@@ -281,14 +371,36 @@ def admin_trigger_alerts():
     Admin endpoint to manually trigger alert checks.
     Useful for testing and on-demand alert evaluation.
     Requires admin role.
+
+    The check is queued on the background scheduler and a task id is
+    returned for polling; it runs inline when the scheduler is disabled.
     """
     try:
+        task_id = queue_manual_check()
+        if task_id is not None:
+            return jsonify({'status': 'queued', 'task_id': task_id}), 202
+
         result = trigger_manual_check()
         return jsonify({'status': 'success', 'message': result}), 200
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+@main_bp.route("/admin/trigger-alerts/<task_id>", methods=['GET'])
+@login_required
+@admin_required
+def admin_trigger_alerts_status(task_id):
+    """
+    Admin endpoint to poll a queued manual alert check.
+    Requires admin role.
+    """
+    status = get_manual_check_status(task_id)
+    if status is None:
+        return jsonify({'status': 'error', 'message': 'Unknown task id'}), 404
+    return jsonify({'status': status['state'], 'task_id': task_id,
+                    'message': status['message']}), 200
+
+
 # React App Routes
 # Serve the React SPA for /app and all sub-routes
 @main_bp.route('/app')
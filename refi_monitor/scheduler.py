@@ -1,20 +1,47 @@
 """Background scheduler for automated rate updates and alert evaluation."""
 import logging
+import uuid
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from flask import Flask, current_app
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, select
 from . import db
-from .models import Alert, Trigger, Mortgage, User
+from .models import (
+    ACTIVE_PAYMENT_STATUS, Alert, ManualAlertCheck, Trigger, Mortgage, User
+)
 from .calc import calc_loan_monthly_payment
-from .notifications import send_alert_notification
-from .rate_updater import RateUpdater
+from .notifications import send_alert_notifications
+from .rate_updater import RateFetcher, RateUpdater, alert_in_cooldown
 
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
 scheduler = None
 
+# Queued manual alert checks are kept in the database so any worker can
+# report their status; rows older than the TTL are purged and at most
+# MANUAL_CHECK_MAX_ROWS are kept
+MANUAL_CHECK_TTL = timedelta(hours=1)
+MANUAL_CHECK_MAX_ROWS = 100
+
+# Fixed-rate products quoted by RateFetcher, keyed by loan term in years
+RATE_TYPE_BY_TERM_YEARS = {
+    30: '30 YR FRM',
+    15: '15 YR FRM',
+}
+
+# Longest loan term (in years) precomputed in a rate lookup
+MAX_TERM_YEARS = 40
+
+# Recurring jobs never overlap, and runs missed while the process was busy
+# or down collapse into a single catch-up run within the grace window
+RECURRING_JOB_OPTIONS = {
+    'max_instances': 1,
+    'coalesce': True,
+    'misfire_grace_time': 3600,
+}
+
 
 def scheduled_rate_update():
     """
@@ -43,44 +70,57 @@ def scheduled_rate_update():
             logger.exception("Full traceback:")
 
 
-def evaluate_alert(alert):
+def build_rate_lookup(current_rates):
+    """
+    Build a term-in-years to market rate lookup from fetched rates.
+
+    Every term from 1 to MAX_TERM_YEARS maps to the rate of the closest
+    quoted term, so evaluating an alert is a single dict lookup.
+
+    Args:
+        current_rates: Dict of rate type to rate, as returned by
+            RateFetcher.fetch_current_rates
+
+    Returns:
+        dict: {term_years: rate}
+    """
+    quoted = {
+        years: current_rates[rate_type]
+        for years, rate_type in RATE_TYPE_BY_TERM_YEARS.items()
+        if rate_type in current_rates
+    }
+    if not quoted:
+        raise ValueError("No fixed-rate terms found in fetched rates")
+
+    return {
+        years: quoted[min(quoted, key=lambda term: abs(term - years))]
+        for years in range(1, MAX_TERM_YEARS + 1)
+    }
+
+
+def evaluate_alert(alert, mortgage, rate_lookup):
     """
     Evaluate if an alert's conditions are met based on current market rates.
 
     Args:
         alert: Alert object to evaluate
+        mortgage: The alert's Mortgage, or None if it no longer exists
+        rate_lookup: Term-in-years to rate dict from build_rate_lookup
 
     Returns:
         tuple: (triggered: bool, reason: str, current_rate: float)
     """
-    mortgage = Mortgage.query.get(alert.mortgage_id)
     if not mortgage:
         return False, "Mortgage not found", None
 
-    # Get current market rates from RateUpdater
-    updater = RateUpdater()
-    current_rates = updater.rate_fetcher.fetch_rates()
-
     # Determine term in years for rate lookup
-    target_term_years = alert.target_term // 12
-    if target_term_years not in current_rates:
-        # Find closest term
-        closest_term = min(current_rates.keys(), key=lambda x: abs(x - target_term_years))
-        current_market_rate = current_rates[closest_term]
-    else:
-        current_market_rate = current_rates[target_term_years]
+    target_term_years = min(max(alert.target_term // 12, 1), MAX_TERM_YEARS)
+    current_market_rate = rate_lookup[target_term_years]
 
     triggered = False
     reason = ""
 
     if alert.alert_type == "monthly_payment" and alert.target_monthly_payment:
-        # Calculate what monthly payment would be at current rates
-        potential_monthly = calc_loan_monthly_payment(
-            mortgage.remaining_principal,
-            current_market_rate,
-            alert.target_term
-        )
-
         # Check if current rates would allow user to meet their target monthly payment
         # Include refinance costs in calculation
         adjusted_principal = mortgage.remaining_principal + alert.estimate_refinance_cost
@@ -120,59 +160,76 @@ def check_and_trigger_alerts(app=None):
     try:
         log.info("Starting scheduled alert check...")
 
-        # Get all active alerts with paid subscriptions
-        active_alerts = Alert.query.filter_by(payment_status='active').all()
+        now = datetime.utcnow()
+
+        # Get all active alerts with paid subscriptions, leaving out those
+        # still in their trigger cooldown (the same rule RateUpdater applies)
+        active_alerts = Alert.query.filter(
+            Alert.payment_status == ACTIVE_PAYMENT_STATUS,
+            ~alert_in_cooldown(now),
+        ).all()
 
         log.info(f"Found {len(active_alerts)} active alerts to check")
 
-        triggered_count = 0
+        # Fetch market rates once for the whole batch
+        rate_lookup = build_rate_lookup(RateFetcher().fetch_current_rates())
+
+        # Load all referenced mortgages in one query instead of one per alert
+        mortgage_ids = {alert.mortgage_id for alert in active_alerts}
+        mortgages = {
+            m.id: m
+            for m in Mortgage.query.filter(Mortgage.id.in_(mortgage_ids)).all()
+        } if mortgage_ids else {}
+
+        # Evaluate every alert in Python, keeping only those whose conditions
+        # are met
+        candidates = []
         for alert in active_alerts:
             try:
                 # Evaluate if alert conditions are met
-                triggered, reason, current_rate = evaluate_alert(alert)
-
+                triggered, reason, current_rate = evaluate_alert(
+                    alert, mortgages.get(alert.mortgage_id), rate_lookup
+                )
                 if triggered:
-                    # Check if we already triggered this alert recently (within 24 hours)
-                    recent_trigger = Trigger.query.filter_by(
-                        alert_id=alert.id,
-                        alert_trigger_status=1
-                    ).order_by(Trigger.created_on.desc()).first()
-
-                    # Only trigger if no recent trigger, or if rate has improved significantly
-                    should_create_trigger = True
-                    if recent_trigger and recent_trigger.created_on:
-                        hours_since_last = (datetime.utcnow() - recent_trigger.created_on).total_seconds() / 3600
-                        if hours_since_last < 24:
-                            should_create_trigger = False
-                            log.info(f"Alert {alert.id} already triggered within 24 hours, skipping")
-
-                    if should_create_trigger:
-                        # Create trigger record
-                        trigger = Trigger(
-                            alert_id=alert.id,
-                            alert_type=alert.alert_type,
-                            alert_trigger_status=1,
-                            alert_trigger_reason=reason,
-                            alert_trigger_date=datetime.utcnow(),
-                            created_on=datetime.utcnow(),
-                            updated_on=datetime.utcnow()
-                        )
-                        db.session.add(trigger)
-                        db.session.commit()
-
-                        log.info(f"Alert {alert.id} triggered: {reason}")
-
-                        # Send notification
-                        send_alert_notification(trigger.id)
-                        triggered_count += 1
-
+                    candidates.append((alert, reason))
             except Exception as e:
                 log.error(f"Error evaluating alert {alert.id}: {str(e)}")
                 continue
 
-        log.info(f"Alert check complete. Triggered {triggered_count} alerts.")
+        if not candidates:
+            log.info("Alert check complete. Triggered 0 alerts.")
+            return
+
+        trigger_rows = []
+        for alert, reason in candidates:
+            trigger_rows.append({
+                'alert_id': alert.id,
+                'alert_type': alert.alert_type,
+                'alert_trigger_status': 1,
+                'alert_trigger_reason': reason,
+                'alert_trigger_date': now,
+                'created_on': now,
+                'updated_on': now,
+            })
+
+            log.info(f"Alert {alert.id} triggered: {reason}")
+
+        # Create every trigger record in a single multi-row INSERT
+        new_trigger_ids = []
+        if trigger_rows:
+            new_trigger_ids = db.session.execute(
+                insert(Trigger).values(trigger_rows).returning(Trigger.id)
+            ).scalars().all()
+            db.session.commit()
+
+        # Send notifications only after the triggers are committed, so mail
+        # delivery doesn't hold the transaction open
+        send_alert_notifications(new_trigger_ids)
+
+        log.info(f"Alert check complete. Triggered {len(new_trigger_ids)} alerts.")
 
     except Exception as e:
+        db.session.rollback()
         log.error(f"Error in scheduled alert check: {str(e)}")
 
 
@@ -227,7 +284,8 @@ def init_scheduler(app: Flask):
         ),
         id='daily_rate_update',
         name='Daily Mortgage Rate Update',
-        replace_existing=True
+        replace_existing=True,
+        **RECURRING_JOB_OPTIONS
     )
 
     # Add job to check alerts daily at 9 AM
@@ -236,7 +294,8 @@ def init_scheduler(app: Flask):
         trigger=CronTrigger(hour=9, minute=0),
         id='daily_alert_check',
         name='Check mortgage alerts daily',
-        replace_existing=True
+        replace_existing=True,
+        **RECURRING_JOB_OPTIONS
     )
 
     # Optional: Add more frequent checks (every 4 hours)
@@ -245,7 +304,8 @@ def init_scheduler(app: Flask):
         trigger=CronTrigger(hour='*/4'),
         id='frequent_alert_check',
         name='Check mortgage alerts every 4 hours',
-        replace_existing=True
+        replace_existing=True,
+        **RECURRING_JOB_OPTIONS
     )
 
     # Start the scheduler
@@ -303,4 +363,84 @@ def trigger_manual_check():
         check_and_trigger_alerts()
         return "Manual alert check completed successfully"
     except Exception as e:
+        db.session.rollback()
         return f"Manual alert check failed: {str(e)}"
+
+
+def _run_manual_check(app, job_id):
+    """Run a queued manual alert check and record its result."""
+    with app.app_context():
+        try:
+            message = trigger_manual_check()
+            check = ManualAlertCheck.query.get(job_id)
+            if check is not None:
+                check.message = message
+                check.completed_on = datetime.utcnow()
+                db.session.commit()
+        finally:
+            # The job runs on a scheduler thread; don't leave its session
+            # behind for the next job
+            db.session.remove()
+
+
+def _purge_manual_checks(now):
+    """Drop expired manual check rows and trim the table to its cap."""
+    db.session.execute(
+        delete(ManualAlertCheck).where(
+            ManualAlertCheck.created_on < now - MANUAL_CHECK_TTL
+        ).execution_options(synchronize_session=False)
+    )
+    newest = select(ManualAlertCheck.id).order_by(
+        ManualAlertCheck.created_on.desc()
+    ).limit(MANUAL_CHECK_MAX_ROWS - 1)
+    db.session.execute(
+        delete(ManualAlertCheck)
+        .where(ManualAlertCheck.id.notin_(newest.scalar_subquery()))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def queue_manual_check():
+    """
+    Queue a one-off alert check on the background scheduler.
+
+    Returns:
+        str: Job id to poll with get_manual_check_status, or None if the
+        scheduler is not running
+    """
+    if scheduler is None or not scheduler.running:
+        return None
+
+    job_id = f'manual_alert_check_{uuid.uuid4().hex}'
+    now = datetime.utcnow()
+    _purge_manual_checks(now)
+    db.session.add(ManualAlertCheck(id=job_id, created_on=now))
+    db.session.commit()
+
+    scheduler.add_job(
+        func=_run_manual_check,
+        args=[current_app._get_current_object(), job_id],
+        id=job_id,
+        name='Manual alert check'
+    )
+    return job_id
+
+
+def get_manual_check_status(job_id):
+    """
+    Get the state of a queued manual alert check.
+
+    Args:
+        job_id: Id returned by queue_manual_check
+
+    Returns:
+        dict: {'state': 'pending'|'complete', 'message': str}, or None if
+        the job id is unknown or has expired
+    """
+    check = ManualAlertCheck.query.get(job_id)
+    if check is None or check.created_on < datetime.utcnow() - MANUAL_CHECK_TTL:
+        return None
+
+    if check.completed_on is None:
+        return {'state': 'pending', 'message': None}
+    return {'state': 'complete', 'message': check.message}
@@ -7,10 +7,21 @@ from datetime import date, datetime
 from typing import Dict, List, Optional
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
 logger = logging.getLogger(__name__)
 
+# All rate data lives inside <tbody> elements; skip building the rest of the page
+RATE_TABLE_STRAINER = SoupStrainer('tbody')
+
 # Rate type mappings from HTML to standardized names
 RATE_TYPE_MAPPING = {
     '30 Yr. Fixed': '30_yr_fixed',
@@ -21,6 +32,16 @@ RATE_TYPE_MAPPING = {
     '7/6 SOFR ARM': '7_6_arm',
 }
 
+# Standardized rate types to the display names RateUpdater expects
+RATE_TYPE_DISPLAY_NAMES = {
+    '30_yr_fixed': '30 YR FRM',
+    '15_yr_fixed': '15 YR FRM',
+    '30_yr_jumbo': 'JUMBO 30 YR',
+    '30_yr_fha': 'FHA 30 YR',
+    '30_yr_va': 'VA 30 YR',
+    '7_6_arm': '5/1 YR ARM',
+}
+
 MND_RATES_URL = 'https://www.mortgagenewsdaily.com/mortgage-rates'
 
 
@@ -72,6 +93,18 @@ class MortgageNewsDailyScraper:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (compatible; RefiAlertBot/1.0)'
         })
+        # Keep connections alive and retry transient failures with backoff
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
     def fetch_page(self) -> str:
         """
@@ -194,7 +227,9 @@ class MortgageNewsDailyScraper:
             ParseError: If parsing fails
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(
+                html, HTML_PARSER, parse_only=RATE_TABLE_STRAINER
+            )
             rates = []
 
             # Find all table sections - look for the MND section
@@ -242,7 +277,13 @@ class MortgageNewsDailyScraper:
                     if not in_mnd_section:
                         continue
 
-                    product_cell = row.find('td', class_='rate-product')
+                    # Collect the row's cells once and locate the product
+                    # cell among them instead of searching the row again
+                    cells = row.find_all('td')
+                    product_cell = next(
+                        (c for c in cells if 'rate-product' in c.get('class', ())),
+                        None,
+                    )
                     if not product_cell:
                         continue
 
@@ -259,8 +300,6 @@ class MortgageNewsDailyScraper:
                         logger.warning(f"Unknown rate type: {product_name}")
                         continue
 
-                    # Get all td cells in the row
-                    cells = row.find_all('td')
                     if len(cells) < 4:
                         logger.warning(f"Unexpected row format for {product_name}")
                         continue
@@ -376,22 +415,11 @@ class MortgageNewsDailyScraper:
         rates = self.fetch_current_rates()
 
         # Convert to dict format expected by RateUpdater
-        result = {}
-        type_display_names = {
-            '30_yr_fixed': '30 YR FRM',
-            '15_yr_fixed': '15 YR FRM',
-            '30_yr_jumbo': 'JUMBO 30 YR',
-            '30_yr_fha': 'FHA 30 YR',
-            '30_yr_va': 'VA 30 YR',
-            '7_6_arm': '5/1 YR ARM',
+        return {
+            RATE_TYPE_DISPLAY_NAMES.get(r.rate_type, r.rate_type): r.rate
+            for r in rates
         }
 
-        for rate_data in rates:
-            display_name = type_display_names.get(rate_data.rate_type, rate_data.rate_type)
-            result[display_name] = rate_data.rate
-
-        return result
-
     def save_to_database(self, rates: List[RateData]) -> int:
         """
         Save rate data to the database.
@@ -404,19 +432,25 @@ class MortgageNewsDailyScraper:
         """
         # Import here to avoid circular imports
         from datetime import datetime
+        from sqlalchemy import insert
         from .. import db
         from ..models import DailyMortgageRate
 
         saved_count = 0
+        new_rates = []
+        now = datetime.utcnow()
+
+        # Load any records that already exist for these dates in one query
+        existing_by_key = {
+            (r.date, r.rate_type): r
+            for r in DailyMortgageRate.query.filter(
+                DailyMortgageRate.date.in_({r.rate_date for r in rates}),
+                DailyMortgageRate.rate_type.in_({r.rate_type for r in rates}),
+            )
+        }
 
         for rate_data in rates:
-            # Check if record already exists
-            existing = DailyMortgageRate.query.filter_by(
-                date=rate_data.rate_date,
-                rate_type=rate_data.rate_type
-            ).first()
-
-            now = datetime.utcnow()
+            existing = existing_by_key.get((rate_data.rate_date, rate_data.rate_type))
 
             if existing:
                 # Update existing record
@@ -426,22 +460,24 @@ class MortgageNewsDailyScraper:
                 existing.updated_at = now
                 logger.debug(f"Updated rate: {rate_data.rate_type} = {rate_data.rate}")
             else:
-                # Create new record
-                new_rate = DailyMortgageRate(
-                    date=rate_data.rate_date,
-                    rate_type=rate_data.rate_type,
-                    rate=rate_data.rate,
-                    points=rate_data.points,
-                    change_from_previous=rate_data.change,
-                    source=rate_data.source,
-                    created_at=now,
-                    updated_at=now,
-                )
-                db.session.add(new_rate)
+                # Queue new record for a single bulk insert
+                new_rates.append({
+                    'date': rate_data.rate_date,
+                    'rate_type': rate_data.rate_type,
+                    'rate': rate_data.rate,
+                    'points': rate_data.points,
+                    'change_from_previous': rate_data.change,
+                    'source': rate_data.source,
+                    'created_at': now,
+                    'updated_at': now,
+                })
                 logger.debug(f"Created rate: {rate_data.rate_type} = {rate_data.rate}")
 
             saved_count += 1
 
+        if new_rates:
+            db.session.execute(insert(DailyMortgageRate), new_rates)
+
         db.session.commit()
         logger.info(f"Saved {saved_count} rates to database")
 
@@ -0,0 +1,167 @@
+"""Tests for the /api/rates endpoints."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from refi_monitor.models import MortgageRate
+
+
+@pytest.fixture
+def rate_history(db_session):
+    """30-year rates spanning the trend windows, plus FHA rates that must not mix in."""
+    today = date.today()
+    db_session.add_all([
+        MortgageRate(date=today - timedelta(days=40), rate_type='30_year_fixed', rate=7.000),
+        MortgageRate(date=today - timedelta(days=10), rate_type='30_year_fixed', rate=6.900),
+        MortgageRate(date=today - timedelta(days=3), rate_type='30_year_fixed', rate=6.800),
+        MortgageRate(date=today, rate_type='30_year_fixed', rate=6.500),
+        MortgageRate(date=today - timedelta(days=3), rate_type='FHA_30', rate=5.000),
+        MortgageRate(date=today, rate_type='FHA_30', rate=6.000),
+    ])
+    db_session.flush()
+    return today
+
+
+@pytest.mark.api
+class TestCurrentRates:
+    """GET /api/rates/current returns the latest date's rates by API id."""
+
+    def test_latest_rates(self, client, rate_history):
+        response = client.get('/api/rates/current')
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['date'] == rate_history.strftime('%Y-%m-%d')
+        assert body['rates'] == {
+            '30-year-fixed': pytest.approx(6.5),
+            'fha-30': pytest.approx(6.0),
+        }
+
+    def test_no_data_is_404(self, client, db_session):
+        assert client.get('/api/rates/current').status_code == 404
+
+
+@pytest.mark.api
+class TestRateTrend:
+    """GET /api/rates/trend compares against earlier rates of the same type."""
+
+    def test_trend_for_rate_type(self, client, rate_history):
+        response = client.get('/api/rates/trend?rate_type=30-year-fixed&period=30')
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['current_rate'] == pytest.approx(6.5)
+        assert body['current_date'] == rate_history.strftime('%Y-%m-%d')
+        # Latest rate on or before the period start (40 days ago)
+        assert body['previous_rate'] == pytest.approx(7.0)
+        assert body['change'] == pytest.approx(-0.5)
+        assert body['change_percent'] == pytest.approx(-7.14)
+        assert body['trend'] == 'down'
+        # Latest rate on or before a week ago (10 days ago)
+        assert body['analysis']['weekly_change'] == pytest.approx(-0.4)
+
+    def test_volatility_uses_lagged_daily_changes(self, client, rate_history):
+        response = client.get('/api/rates/trend?rate_type=30-year-fixed&period=30')
+
+        # Daily changes inside the period are -0.1 and -0.3 (the FHA rates
+        # are excluded), whose population standard deviation is 0.1
+        assert response.get_json()['analysis']['volatility'] == pytest.approx(0.1)
+
+    def test_single_rate_has_zero_volatility(self, client, rate_history):
+        response = client.get('/api/rates/trend?rate_type=fha-30&period=1')
+
+        body = response.get_json()
+        assert body['current_rate'] == pytest.approx(6.0)
+        assert body['analysis']['volatility'] == 0
+
+    def test_no_data_is_404(self, client, rate_history):
+        response = client.get('/api/rates/trend?rate_type=va-30')
+        assert response.status_code == 404
+
+
+@pytest.mark.api
+class TestRateHistory:
+    """GET /api/rates/history returns one rate type's series in date order."""
+
+    def test_history_within_days(self, client, rate_history):
+        response = client.get('/api/rates/history?rate_type=30-year-fixed&days=30')
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert [point['date'] for point in body['data']] == [
+            (rate_history - timedelta(days=10)).strftime('%Y-%m-%d'),
+            (rate_history - timedelta(days=3)).strftime('%Y-%m-%d'),
+            rate_history.strftime('%Y-%m-%d'),
+        ]
+        assert [point['rate'] for point in body['data']] == [
+            pytest.approx(6.9), pytest.approx(6.8), pytest.approx(6.5),
+        ]
+        assert body['count'] == 3
+        assert body['min_rate'] == pytest.approx(6.5)
+        assert body['max_rate'] == pytest.approx(6.9)
+        assert body['avg_rate'] == pytest.approx(6.733)
+
+    def test_explicit_date_range_is_inclusive(self, client, rate_history):
+        start = (rate_history - timedelta(days=40)).strftime('%Y-%m-%d')
+        end = (rate_history - timedelta(days=10)).strftime('%Y-%m-%d')
+        response = client.get(
+            f'/api/rates/history?rate_type=30-year-fixed&start_date={start}&end_date={end}'
+        )
+
+        body = response.get_json()
+        assert [point['rate'] for point in body['data']] == [
+            pytest.approx(7.0), pytest.approx(6.9),
+        ]
+        assert body['start_date'] == start
+        assert body['end_date'] == end
+
+    def test_empty_history(self, client, rate_history):
+        body = client.get('/api/rates/history?rate_type=va-30').get_json()
+        assert body['data'] == []
+        assert body['min_rate'] is None
+
+    def test_invalid_date_is_400(self, client, db_session):
+        response = client.get('/api/rates/history?start_date=01/02/2026')
+        assert response.status_code == 400
+
+
+@pytest.mark.api
+class TestExportRatesCsv:
+    """GET /api/rates/export streams a CSV of rates by date and type."""
+
+    def test_exports_all_types_in_date_order(self, client, rate_history):
+        response = client.get('/api/rates/export?days=30')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        day = lambda n: (rate_history - timedelta(days=n)).strftime('%Y-%m-%d')
+        assert response.get_data(as_text=True).splitlines() == [
+            'date,rate_type,rate',
+            f'{day(10)},30-year-fixed,6.900',
+            f'{day(3)},30-year-fixed,6.800',
+            f'{day(3)},fha-30,5.000',
+            f'{day(0)},30-year-fixed,6.500',
+            f'{day(0)},fha-30,6.000',
+        ]
+
+    def test_filters_by_rate_type(self, client, rate_history):
+        response = client.get('/api/rates/export?rate_type=fha-30&days=30')
+
+        lines = response.get_data(as_text=True).splitlines()
+        assert lines[0] == 'date,rate_type,rate'
+        assert [line.split(',')[1] for line in lines[1:]] == ['fha-30', 'fha-30']
+
+    def test_streams_in_batches(self, client, rate_history, monkeypatch):
+        from refi_monitor.api import rates
+
+        monkeypatch.setattr(rates, 'EXPORT_BATCH_SIZE', 2)
+        response = client.get('/api/rates/export?days=365', buffered=False)
+
+        assert response.is_streamed
+        chunks = [chunk for chunk in response.response if chunk]
+        response.close()
+
+        # Header plus six rows, flushed every two rows
+        assert len(chunks) == 3
+        assert b''.join(chunks).decode().count('\n') == 7
@@ -5,6 +5,7 @@ This file is automatically loaded by pytest and makes fixtures
 available to all test files without needing to import them.
 """
 import pytest
+from sqlalchemy import event
 from refi_monitor import init_app
 
 
@@ -84,6 +85,77 @@ def db_session(_db, app):
         session.remove()
 
 
+@pytest.fixture(scope='function')
+def query_counter(_db):
+    """
+    Record every SQL statement executed during a test.
+
+    Yields a list of statement strings; clear() it before the code under
+    test to count only that code's queries. Lets tests pin the number of
+    round trips a view makes, so accidental lazy loads (N+1 queries) fail.
+
+    Scope: function - listener removed after each test
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(_db.engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(_db.engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture(scope='function')
+def user(db_session, sample_user_data):
+    """
+    A saved user built from sample_user_data.
+
+    Scope: function - rolled back with db_session
+    """
+    from werkzeug.security import generate_password_hash
+    from refi_monitor.models import User
+
+    # User.set_password uses scrypt, which the pinned Werkzeug doesn't
+    # support; the fixture only needs a hash check_password can verify
+    user = User(
+        name=sample_user_data['name'],
+        email=sample_user_data['email'],
+        credit_score=sample_user_data['credit_score'],
+        password=generate_password_hash(
+            sample_user_data['password'], method='pbkdf2:sha256'
+        ),
+    )
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+@pytest.fixture(scope='function')
+def mortgage(db_session, user, sample_mortgage_data):
+    """
+    A saved mortgage for user built from sample_mortgage_data.
+
+    Scope: function - rolled back with db_session
+    """
+    from refi_monitor.models import Mortgage
+
+    mortgage = Mortgage(
+        user_id=user.id,
+        name='Test Mortgage',
+        zip_code=sample_mortgage_data['zip_code'],
+        original_principal=sample_mortgage_data['original_principal'],
+        original_term=sample_mortgage_data['original_term'],
+        original_interest_rate=sample_mortgage_data['original_rate'],
+        remaining_principal=sample_mortgage_data['remaining_principal'],
+        remaining_term=sample_mortgage_data['remaining_term'],
+        credit_score=sample_mortgage_data['credit_score'],
+    )
+    db_session.add(mortgage)
+    db_session.flush()
+    return mortgage
+
+
 @pytest.fixture
 def sample_user_data():
     """
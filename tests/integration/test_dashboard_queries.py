@@ -0,0 +1,75 @@
+"""Query-count tests for the dashboard data loaders."""
+
+import pytest
+
+from refi_monitor.models import Alert, Mortgage
+from refi_monitor.routes import get_mortgage_alerts
+
+
+@pytest.fixture
+def user_with_alerts(db_session, user, sample_mortgage_data):
+    """A user with three mortgages, each with one paid alert and one unpaid."""
+    for i in range(3):
+        mortgage = Mortgage(
+            user_id=user.id,
+            name=f'Mortgage {i}',
+            zip_code=sample_mortgage_data['zip_code'],
+            original_principal=sample_mortgage_data['original_principal'],
+            original_term=sample_mortgage_data['original_term'],
+            original_interest_rate=sample_mortgage_data['original_rate'],
+            remaining_principal=sample_mortgage_data['remaining_principal'],
+            remaining_term=sample_mortgage_data['remaining_term'],
+            credit_score=sample_mortgage_data['credit_score'],
+        )
+        db_session.add(mortgage)
+        db_session.flush()
+        db_session.add(Alert(
+            user_id=user.id,
+            mortgage_id=mortgage.id,
+            alert_type='Interest Rate',
+            target_interest_rate=0.03,
+            target_term=360,
+            estimate_refinance_cost=5000.0,
+            initial_payment=True,
+            payment_status='active',
+        ))
+        db_session.add(Alert(
+            user_id=user.id,
+            mortgage_id=mortgage.id,
+            alert_type='Monthly Payment',
+            target_monthly_payment=1500.0,
+            target_term=360,
+            estimate_refinance_cost=5000.0,
+            initial_payment=False,
+            payment_status='incomplete',
+        ))
+    db_session.flush()
+    db_session.expunge_all()
+    return user
+
+
+@pytest.mark.integration
+class TestGetMortgageAlertsQueries:
+    """get_mortgage_alerts must not issue a query per mortgage."""
+
+    def test_loads_mortgages_and_alerts_in_one_query(
+        self, app, user_with_alerts, query_counter
+    ):
+        with app.test_request_context():
+            query_counter.clear()
+            mortgages, alerts, mortgage_alerts = get_mortgage_alerts(
+                user_with_alerts.id, with_plots=False
+            )
+
+            # Mortgages and alerts come back from a single joined SELECT
+            assert len(query_counter) == 1
+            assert len(mortgages) == 3
+            # Unpaid alerts are filtered out by the database
+            assert len(alerts) == 3
+            assert all(a.initial_payment for a in alerts)
+
+            # Reading rows the way the templates do must not lazy-load
+            for m, a, _, _ in mortgage_alerts:
+                assert a in m.alerts
+                assert a.alert_type == 'Interest Rate'
+            assert len(query_counter) == 1
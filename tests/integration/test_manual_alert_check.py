@@ -0,0 +1,115 @@
+"""Tests for queued manual alert checks and their status endpoint."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from refi_monitor import scheduler as scheduler_module
+from refi_monitor.models import ManualAlertCheck
+
+
+class FakeScheduler:
+    """
+    Collects queued jobs so a test decides when they run.
+
+    Jobs run inline on the test's thread, so they share the test's session
+    and must leave its transaction (and the logged-in admin) in place.
+    """
+
+    running = True
+
+    def __init__(self):
+        self.jobs = []
+
+    def add_job(self, func, args, id, name):
+        self.jobs.append((func, args))
+
+    def run_jobs(self):
+        jobs, self.jobs = self.jobs, []
+        for func, args in jobs:
+            func(*args)
+
+
+@pytest.fixture
+def fake_scheduler(monkeypatch):
+    """Queue manual checks on a FakeScheduler with a no-op alert check."""
+    fake = FakeScheduler()
+    monkeypatch.setattr(scheduler_module, 'scheduler', fake)
+    monkeypatch.setattr(scheduler_module, 'check_and_trigger_alerts', lambda: None)
+    return fake
+
+
+@pytest.fixture
+def admin_client(client, user, db_session):
+    """Test client logged in as an admin user."""
+    user.is_admin = True
+    db_session.flush()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user.id)
+        sess['_fresh'] = True
+    return client
+
+
+@pytest.mark.integration
+class TestManualAlertCheck:
+    """POST queues a check (202); GET reports its status from the database."""
+
+    def test_queue_then_poll_until_complete(self, app, admin_client, fake_scheduler):
+        response = admin_client.post('/admin/trigger-alerts')
+        assert response.status_code == 202
+        task_id = response.get_json()['task_id']
+
+        # The status lives in the database, not in this worker's memory
+        with app.app_context():
+            assert ManualAlertCheck.query.get(task_id) is not None
+
+        response = admin_client.get(f'/admin/trigger-alerts/{task_id}')
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'status': 'pending', 'task_id': task_id, 'message': None,
+        }
+
+        fake_scheduler.run_jobs()
+
+        # Still logged in: the job didn't roll back the test's data
+        response = admin_client.get(f'/admin/trigger-alerts/{task_id}')
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'status': 'complete',
+            'task_id': task_id,
+            'message': 'Manual alert check completed successfully',
+        }
+
+    def test_unknown_task_is_404(self, admin_client, fake_scheduler):
+        response = admin_client.get('/admin/trigger-alerts/manual_alert_check_missing')
+        assert response.status_code == 404
+
+    def test_expired_checks_are_purged(self, app, admin_client, fake_scheduler,
+                                       db_session):
+        db_session.add(ManualAlertCheck(
+            id='manual_alert_check_old',
+            created_on=datetime.utcnow() - scheduler_module.MANUAL_CHECK_TTL
+            - timedelta(minutes=1),
+            message='Manual alert check completed successfully',
+            completed_on=datetime.utcnow() - scheduler_module.MANUAL_CHECK_TTL,
+        ))
+        db_session.commit()
+
+        response = admin_client.post('/admin/trigger-alerts')
+        assert response.status_code == 202
+
+        with app.app_context():
+            assert ManualAlertCheck.query.get('manual_alert_check_old') is None
+            assert ManualAlertCheck.query.count() == 1
+
+    def test_table_is_capped(self, app, admin_client, fake_scheduler, monkeypatch):
+        monkeypatch.setattr(scheduler_module, 'MANUAL_CHECK_MAX_ROWS', 2)
+
+        task_ids = [
+            admin_client.post('/admin/trigger-alerts').get_json()['task_id']
+            for _ in range(3)
+        ]
+
+        with app.app_context():
+            assert ManualAlertCheck.query.count() == 2
+            assert ManualAlertCheck.query.get(task_ids[-1]) is not None
@@ -0,0 +1,93 @@
+"""Tests for the dashboard mortgage overview."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from refi_monitor.models import MortgageRate
+from refi_monitor.rate_updater import get_recent_market_rates
+from refi_monitor.routes import get_mortgage_overview
+
+
+@pytest.fixture
+def market_rates(db_session):
+    """Three days of 30-year rates and one day of 15-year rates."""
+    today = date.today()
+    db_session.add_all([
+        MortgageRate(date=today - timedelta(days=2), rate_type='30_year_fixed', rate=7.000),
+        MortgageRate(date=today - timedelta(days=1), rate_type='30_year_fixed', rate=6.750),
+        MortgageRate(date=today, rate_type='30_year_fixed', rate=6.500),
+        MortgageRate(date=today, rate_type='15_year_fixed', rate=5.875),
+        MortgageRate(date=today, rate_type='FHA_30', rate=6.250),
+    ])
+    db_session.flush()
+    return today
+
+
+@pytest.mark.integration
+class TestGetRecentMarketRates:
+    """get_recent_market_rates reads MortgageRate by rate_type and date."""
+
+    def test_returns_newest_rates_first_as_decimals(self, app, market_rates):
+        with app.app_context():
+            recent = get_recent_market_rates(['30_year_fixed', '15_year_fixed'])
+
+        assert recent['30_year_fixed'] == (
+            (pytest.approx(0.065), market_rates),
+            (pytest.approx(0.0675), market_rates - timedelta(days=1)),
+        )
+        assert recent['15_year_fixed'] == ((pytest.approx(0.05875), market_rates),)
+
+    def test_missing_rate_type_is_empty(self, app, db_session):
+        with app.app_context():
+            assert get_recent_market_rates(['VA_30']) == {'VA_30': ()}
+
+    def test_rate_written_after_lookup_is_seen(self, app, db_session, market_rates):
+        with app.app_context():
+            assert get_recent_market_rates(['VA_30']) == {'VA_30': ()}
+
+            db_session.add(MortgageRate(date=market_rates, rate_type='VA_30', rate=6.125))
+            db_session.flush()
+
+            assert get_recent_market_rates(['VA_30']) == {
+                'VA_30': ((pytest.approx(0.06125), market_rates),)
+            }
+
+
+@pytest.mark.integration
+class TestGetMortgageOverview:
+    """get_mortgage_overview combines the user's mortgages with market rates."""
+
+    def test_aggregates_in_sql(self, app, user, mortgage, market_rates,
+                               sample_mortgage_data):
+        with app.app_context():
+            overview = get_mortgage_overview(user.id)
+
+        assert overview['total_mortgages'] == 1
+        assert overview['total_principal'] == pytest.approx(
+            sample_mortgage_data['remaining_principal']
+        )
+        assert overview['avg_user_rate'] == pytest.approx(4.5)
+        assert overview['current_30yr_rate'] == pytest.approx(6.5)
+        assert overview['current_15yr_rate'] == pytest.approx(5.875)
+        assert overview['rate_change_30yr'] == pytest.approx(-0.25)
+        assert overview['rate_date'] == market_rates
+        # The user's 4.5% is below market, so there is nothing to save
+        assert overview['potential_savings'] == 0
+
+    def test_preloaded_mortgages_match_sql(self, app, user, mortgage, market_rates):
+        with app.app_context():
+            assert get_mortgage_overview(user.id, [mortgage]) == get_mortgage_overview(user.id)
+
+    def test_falls_back_without_rate_data(self, app, user, mortgage):
+        with app.app_context():
+            overview = get_mortgage_overview(user.id)
+
+        assert overview['current_30yr_rate'] == pytest.approx(6.5)
+        assert overview['current_15yr_rate'] == pytest.approx(5.8)
+        assert overview['rate_change_30yr'] == 0
+        assert overview['rate_date'] is None
+
+    def test_no_mortgages(self, app, user):
+        with app.app_context():
+            assert get_mortgage_overview(user.id) is None
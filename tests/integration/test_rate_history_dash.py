@@ -0,0 +1,59 @@
+"""Tests for the rate history dashboard's data loading."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from refi_monitor.dash.rate_history_dash import get_current_rates, get_rate_data
+from refi_monitor.models import MortgageRate
+
+
+@pytest.fixture
+def market_rates(db_session):
+    """Two days of 30- and 15-year rates plus an FHA rate with no dashboard id."""
+    today = date.today()
+    db_session.add_all([
+        MortgageRate(date=today - timedelta(days=1), rate_type='30_year_fixed', rate=6.750),
+        MortgageRate(date=today, rate_type='30_year_fixed', rate=6.500),
+        MortgageRate(date=today, rate_type='15_year_fixed', rate=5.875),
+        MortgageRate(date=today, rate_type='FHA_30', rate=6.250),
+    ])
+    db_session.flush()
+    return today
+
+
+@pytest.mark.integration
+class TestGetRateData:
+    """get_rate_data returns a frame keyed by dashboard rate type ids."""
+
+    def test_selected_types_in_date_order(self, app, market_rates):
+        with app.app_context():
+            df = get_rate_data(['30-year-fixed', '15-year-fixed'], 30)
+
+        assert list(df.columns) == ['date', 'rate', 'rate_type']
+        assert pd.api.types.is_datetime64_any_dtype(df['date'])
+        assert df['rate'].dtype == float
+        thirty = df[df['rate_type'] == '30-year-fixed']
+        assert list(thirty['rate']) == [pytest.approx(6.75), pytest.approx(6.5)]
+        assert list(df[df['rate_type'] == '15-year-fixed']['rate']) == [pytest.approx(5.875)]
+
+    def test_unknown_ids_return_empty_frame(self, app, market_rates):
+        with app.app_context():
+            assert get_rate_data(['jumbo-30'], 30).empty
+
+
+@pytest.mark.integration
+class TestGetCurrentRates:
+    """get_current_rates returns the latest date's rates as floats."""
+
+    def test_latest_rates_with_fallback_names(self, app, market_rates):
+        with app.app_context():
+            latest_date, rates = get_current_rates()
+
+        assert latest_date == market_rates
+        assert rates == {
+            '30-year-fixed': pytest.approx(6.5),
+            '15-year-fixed': pytest.approx(5.875),
+            'FHA_30': pytest.approx(6.25),
+        }
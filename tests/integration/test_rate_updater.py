@@ -0,0 +1,157 @@
+"""Tests for the rate updater's alert triggering and notification."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from refi_monitor import notifications
+from refi_monitor import scheduler as scheduler_module
+from refi_monitor.models import ACTIVE_PAYMENT_STATUS, Alert, Trigger
+from refi_monitor.rate_updater import ALERT_COOLDOWN, RateUpdater
+
+
+class FakeFetcher:
+    """Returns a fixed set of market rates."""
+
+    def __init__(self, rates):
+        self.rates = rates
+
+    def fetch_current_rates(self):
+        return self.rates
+
+
+@pytest.fixture
+def make_alert(db_session, user, mortgage):
+    """Create an alert on the test mortgage."""
+    def make(target_interest_rate, payment_status=ACTIVE_PAYMENT_STATUS):
+        alert = Alert(
+            user_id=user.id,
+            mortgage_id=mortgage.id,
+            alert_type='interest_rate',
+            target_interest_rate=target_interest_rate,
+            target_term=360,
+            estimate_refinance_cost=5000.0,
+            initial_payment=True,
+            payment_status=payment_status,
+        )
+        db_session.add(alert)
+        db_session.flush()
+        return alert
+    return make
+
+
+@pytest.fixture
+def sent_mail(monkeypatch):
+    """Record outgoing messages instead of sending them."""
+    sent = []
+    monkeypatch.setattr(notifications.mail, 'send', sent.append)
+    return sent
+
+
+@pytest.mark.integration
+class TestCheckAndTriggerAlerts:
+    """Triggers are inserted in one statement for eligible alerts only."""
+
+    def test_inserts_one_trigger_per_eligible_alert(self, app, db_session, make_alert):
+        met = [make_alert(0.07), make_alert(0.068)]
+        make_alert(0.05)  # target not reached
+        make_alert(0.07, payment_status='paid')  # not notifiable, so not triggered
+        make_alert(0.07, payment_status=None)
+        now = datetime.utcnow()
+
+        with app.app_context():
+            trigger_ids = RateUpdater(FakeFetcher({}))._check_and_trigger_alerts(0.065, now)
+            triggers = Trigger.query.filter(Trigger.id.in_(trigger_ids)).all()
+
+        # RETURNING hands back the ids of exactly the rows inserted
+        assert len(set(trigger_ids)) == 2
+        assert {t.id for t in triggers} == set(trigger_ids)
+        assert {t.alert_id for t in triggers} == {a.id for a in met}
+        for trigger in triggers:
+            assert trigger.alert_trigger_status == 1
+            assert trigger.alert_type == 'interest_rate'
+            assert trigger.alert_trigger_date == now
+            assert trigger.created_on == now
+            assert trigger.alert_trigger_reason.startswith('Rate 0.0650 met target')
+
+    def test_skips_alerts_in_cooldown(self, app, db_session, make_alert):
+        alert = make_alert(0.07)
+        now = datetime.utcnow()
+        db_session.add(Trigger(
+            alert_id=alert.id,
+            alert_type='interest_rate',
+            alert_trigger_status=1,
+            alert_trigger_reason='earlier run',
+            alert_trigger_date=now - timedelta(hours=1),
+        ))
+        db_session.flush()
+
+        with app.app_context():
+            updater = RateUpdater(FakeFetcher({}))
+            assert updater._check_and_trigger_alerts(0.065, now) == []
+            # Once the 24 hour cooldown has passed it fires again
+            assert len(updater._check_and_trigger_alerts(0.065, now + timedelta(hours=24))) == 1
+
+
+@pytest.mark.integration
+class TestUpdateAllRates:
+    """Every trigger created by a run is notified."""
+
+    def test_triggered_alerts_are_emailed(self, app, db_session, user, make_alert,
+                                          sent_mail):
+        make_alert(0.07)
+        make_alert(0.07, payment_status='paid')
+        email = user.email
+
+        with app.app_context():
+            stats = RateUpdater(FakeFetcher({'30 YR FRM': 0.065})).update_all_rates()
+
+        assert stats['alerts_triggered'] == 1
+        assert [msg.recipients for msg in sent_mail] == [[email]]
+
+
+def add_trigger(db_session, alert, triggered_at):
+    """Record a successful trigger for alert at triggered_at."""
+    db_session.add(Trigger(
+        alert_id=alert.id,
+        alert_type=alert.alert_type,
+        alert_trigger_status=1,
+        alert_trigger_reason='earlier run',
+        alert_trigger_date=triggered_at,
+        created_on=triggered_at,
+        updated_on=triggered_at,
+    ))
+    db_session.flush()
+
+
+@pytest.mark.integration
+class TestScheduledAlertCheck:
+    """The scheduled check applies the same SQL cooldown as RateUpdater."""
+
+    @pytest.fixture(autouse=True)
+    def fake_rates(self, monkeypatch):
+        monkeypatch.setattr(
+            scheduler_module, 'RateFetcher',
+            lambda: FakeFetcher({'30 YR FRM': 0.065, '15 YR FRM': 0.055}),
+        )
+        monkeypatch.setattr(scheduler_module, 'send_alert_notifications', lambda ids: 0)
+
+    def test_skips_alerts_in_cooldown(self, app, db_session, make_alert):
+        fresh = make_alert(0.07)
+        cooling = make_alert(0.07)
+        expired = make_alert(0.07)
+        now = datetime.utcnow()
+        add_trigger(db_session, cooling, now - timedelta(hours=1))
+        add_trigger(db_session, expired, now - ALERT_COOLDOWN - timedelta(minutes=1))
+        fresh_id, cooling_id, expired_id = fresh.id, cooling.id, expired.id
+
+        with app.app_context():
+            scheduler_module.check_and_trigger_alerts()
+            triggered = {
+                alert_id for (alert_id,) in db_session.query(Trigger.alert_id).filter(
+                    Trigger.alert_trigger_reason != 'earlier run'
+                )
+            }
+
+        assert triggered == {fresh_id, expired_id}
+        assert cooling_id not in triggered
@@ -507,6 +507,14 @@ class TestCreateEfficientFrontier:
         assert isinstance(result, pd.DataFrame)
         assert result['amount_remaining'].iloc[0] > 900000
 
+    def test_repeated_call_unaffected_by_mutation(self):
+        """Test that modifying a returned frame doesn't leak into later calls"""
+        first = create_efficient_frontier(200000, 0.05, 360, 190000, 348, 360, 4000)
+        expected = first['interest_rate'].copy()
+        first['interest_rate'] = 0
+        second = create_efficient_frontier(200000, 0.05, 360, 190000, 348, 360, 4000)
+        assert np.allclose(second['interest_rate'], expected)
+
 
 # =============================================================================
 # find_break_even_interest() - 12 tests
@@ -688,6 +696,13 @@ class TestCreateMortgageRange:
         payments = result['monthly_payment'].iloc[1:].values
         assert all(np.diff(payments) > 0)
 
+    def test_matches_scalar_payment(self):
+        """Test that payments match calc_loan_monthly_payment at each rate"""
+        result = create_mortage_range(300000, 360)
+        for rate, payment in zip(result['rate'], result['monthly_payment']):
+            expected = calc_loan_monthly_payment(300000, rate, 360)
+            assert abs(payment - expected) < TOLERANCE
+
 
 # =============================================================================
 # Helper Functions - 8 tests
@@ -727,6 +742,12 @@ class TestIpmtTotal:
         full_result = ipmt_total(0.06, 360, 300000)
         assert result < full_result
 
+    def test_full_term_matches_explicit_per(self):
+        """Test full-term total matches summing the full period schedule"""
+        result = ipmt_total(0.045, 180, 250000)
+        explicit = ipmt_total(0.045, 180, 250000, get_per(180))
+        assert abs(result - explicit) < TOLERANCE
+
 
 class TestGetPer:
     """Tests for get_per function"""
@@ -0,0 +1,50 @@
+"""Tests for the Jinja bytecode cache setup."""
+
+import logging
+import os
+from types import SimpleNamespace
+
+from jinja2 import FileSystemBytecodeCache
+
+from refi_monitor import init_jinja_bytecode_cache
+
+
+def make_app(cache_dir, debug=False):
+    """Minimal stand-in for the Flask app attributes the setup reads."""
+    return SimpleNamespace(
+        config={'JINJA_BYTECODE_CACHE_DIR': cache_dir},
+        debug=debug,
+        jinja_env=SimpleNamespace(bytecode_cache=None),
+        logger=logging.getLogger(__name__),
+    )
+
+
+class TestInitJinjaBytecodeCache:
+    """The cache is opt-in and only uses a private directory."""
+
+    def test_off_when_not_configured(self):
+        app = make_app(None)
+        init_jinja_bytecode_cache(app)
+        assert app.jinja_env.bytecode_cache is None
+
+    def test_off_in_debug(self, tmp_path):
+        app = make_app(str(tmp_path / 'jinja'), debug=True)
+        init_jinja_bytecode_cache(app)
+        assert app.jinja_env.bytecode_cache is None
+
+    def test_creates_private_directory(self, tmp_path):
+        cache_dir = tmp_path / 'jinja'
+        app = make_app(str(cache_dir))
+        init_jinja_bytecode_cache(app)
+
+        assert isinstance(app.jinja_env.bytecode_cache, FileSystemBytecodeCache)
+        assert cache_dir.stat().st_mode & 0o777 == 0o700
+
+    def test_refuses_shared_directory(self, tmp_path):
+        cache_dir = tmp_path / 'jinja'
+        cache_dir.mkdir()
+        os.chmod(cache_dir, 0o777)
+        app = make_app(str(cache_dir))
+        init_jinja_bytecode_cache(app)
+
+        assert app.jinja_env.bytecode_cache is None
@@ -0,0 +1,93 @@
+"""Unit tests for batched alert notification delivery."""
+
+import threading
+
+import pytest
+from flask_mail import Message
+
+from refi_monitor import db, notifications
+
+
+@pytest.fixture
+def built_messages(monkeypatch):
+    """Skip the database: triggers 1-3 each build a message to user<id>."""
+    monkeypatch.setattr(
+        notifications, '_load_trigger_rows',
+        lambda trigger_ids: {trigger_id: object() for trigger_id in trigger_ids},
+    )
+    monkeypatch.setattr(
+        notifications, '_build_alert_message',
+        lambda trigger_id, row: Message(
+            subject='Alert', recipients=[f'user{trigger_id}@example.com'], body='',
+        ),
+    )
+
+
+@pytest.fixture
+def mail_send(monkeypatch):
+    """mail.send that records every recipient and fails for user2."""
+    attempted = []
+
+    def send(msg):
+        attempted.append(msg.recipients[0])
+        if msg.recipients[0] == 'user2@example.com':
+            raise ConnectionError('SMTP connection dropped')
+
+    monkeypatch.setattr(notifications.mail, 'send', send)
+    return attempted
+
+
+@pytest.fixture
+def session_removals(monkeypatch):
+    """Record the thread of every db.session.remove() (app context teardown)."""
+    threads = []
+    remove = db.session.remove
+
+    def recording_remove():
+        threads.append(threading.current_thread())
+        remove()
+
+    monkeypatch.setattr(db.session, 'remove', recording_remove)
+    return threads
+
+
+@pytest.mark.unit
+class TestSendAlertNotifications:
+    """Deliveries fan out over a thread pool, one app context per send."""
+
+    def test_failed_send_does_not_stop_the_others(self, app, built_messages,
+                                                  mail_send):
+        with app.app_context():
+            sent = notifications.send_alert_notifications([1, 2, 3])
+
+        assert sent == 2
+        assert sorted(mail_send) == [
+            'user1@example.com', 'user2@example.com', 'user3@example.com',
+        ]
+
+    def test_worker_sessions_are_removed(self, app, built_messages, mail_send,
+                                         session_removals):
+        main_thread = threading.current_thread()
+        with app.app_context():
+            notifications.send_alert_notifications([1, 2, 3])
+            worker_removals = [t for t in session_removals if t is not main_thread]
+
+        # Every delivery ran in a worker's own app context, whose teardown
+        # removed that thread's session, including the one that failed
+        assert len(worker_removals) == 3
+
+    def test_no_triggers_sends_nothing(self, app, mail_send):
+        with app.app_context():
+            assert notifications.send_alert_notifications([]) == 0
+        assert mail_send == []
+
+
+@pytest.mark.unit
+class TestSendAlertNotification:
+    """The single-trigger helper goes through the batch path."""
+
+    def test_reports_whether_sent(self, app, built_messages, mail_send):
+        with app.app_context():
+            assert notifications.send_alert_notification(1) is True
+            assert notifications.send_alert_notification(2) is False
+        assert mail_send == ['user1@example.com', 'user2@example.com']
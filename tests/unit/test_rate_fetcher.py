@@ -0,0 +1,46 @@
+"""Unit tests for RateFetcher's short-lived rates cache."""
+
+from datetime import datetime
+
+import pytest
+
+from refi_monitor import rate_updater
+from refi_monitor.rate_updater import RATES_CACHE_TTL, RateFetcher
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Start from an empty cache and count calls to the rate source."""
+    calls = []
+
+    def fetch(self):
+        calls.append(datetime.utcnow())
+        return {'30 YR FRM': 0.065}
+
+    monkeypatch.setattr(rate_updater, '_rates_cache', None)
+    monkeypatch.setattr(RateFetcher, '_fetch_rates', fetch)
+    return calls
+
+
+@pytest.mark.unit
+class TestFetchCurrentRates:
+    """Fetched rates are reused only for RATES_CACHE_TTL."""
+
+    def test_reuses_recent_rates(self, fetches):
+        assert RateFetcher().fetch_current_rates() == {'30 YR FRM': 0.065}
+        assert RateFetcher().fetch_current_rates() == {'30 YR FRM': 0.065}
+        assert len(fetches) == 1
+
+    def test_refetches_after_ttl(self, fetches, monkeypatch):
+        RateFetcher().fetch_current_rates()
+        fetched_at, rates = rate_updater._rates_cache
+        monkeypatch.setattr(
+            rate_updater, '_rates_cache', (fetched_at - RATES_CACHE_TTL, rates)
+        )
+
+        RateFetcher().fetch_current_rates()
+        assert len(fetches) == 2
+
+    def test_callers_get_their_own_copy(self, fetches):
+        RateFetcher().fetch_current_rates()['30 YR FRM'] = 0.0
+        assert RateFetcher().fetch_current_rates() == {'30 YR FRM': 0.065}